@@ -1,28 +1,51 @@
 import os
+import threading
 from dotenv import load_dotenv
 from pathlib import Path
+from functools import cached_property
 
 
 class Config:
     def __init__(self):
-        load_dotenv()
+        # 各設定値は初回アクセス時に読み込む
         self.root_dir = Path(__file__).parent
-        self.notion_token = os.getenv("NOTION_TOKEN")
-        self.notion_database_id = os.getenv("NOTION_DATABASE_ID")
-        self.slack_bot_token = os.getenv("SLACK_BOT_TOKEN")
-        self.slack_app_token = os.getenv("SLACK_APP_TOKEN")
 
-        self.data_dir = self.root_dir / "data"
-        self.models_dir = self.root_dir / "models"
-        self.pretrained_dir = self.models_dir / "ai" / "pretrained"
+    @cached_property
+    def _env(self):
+        """.envを読み込み、環境変数を一度だけ辞書へ退避する"""
+        load_dotenv()
+        return dict(os.environ)
+
+    @cached_property
+    def notion_token(self):
+        return self._env.get("NOTION_TOKEN")
 
-        # AIモデルのパス設定
-        self.model_paths = self._setup_model_paths()
-        
-        # 学習設定
-        self.training_config = self._setup_training_config()
+    @cached_property
+    def notion_database_id(self):
+        return self._env.get("NOTION_DATABASE_ID")
+
+    @cached_property
+    def slack_bot_token(self):
+        return self._env.get("SLACK_BOT_TOKEN")
+
+    @cached_property
+    def slack_app_token(self):
+        return self._env.get("SLACK_APP_TOKEN")
+
+    @cached_property
+    def data_dir(self):
+        return self.root_dir / "data"
+
+    @cached_property
+    def models_dir(self):
+        return self.root_dir / "models"
 
-    def _setup_model_paths(self):
+    @cached_property
+    def pretrained_dir(self):
+        return self.models_dir / "ai" / "pretrained"
+
+    @cached_property
+    def model_paths(self):
         """AIモデルのパス設定を初期化"""
         # デフォルトのモデルパス
         default_paths = {
@@ -33,17 +56,18 @@ class Config:
         
         # 環境変数が設定されている場合は優先
         return {
-            'word2vec': os.getenv("WORD2VEC_MODEL_PATH", default_paths['word2vec']),
-            'fasttext': os.getenv("FASTTEXT_MODEL_PATH", default_paths['fasttext']),
-            'laser': os.getenv("LASER_MODEL_PATH", default_paths['laser'])
+            'word2vec': self._env.get("WORD2VEC_MODEL_PATH", default_paths['word2vec']),
+            'fasttext': self._env.get("FASTTEXT_MODEL_PATH", default_paths['fasttext']),
+            'laser': self._env.get("LASER_MODEL_PATH", default_paths['laser'])
         }
 
-    def _setup_training_config(self):
+    @cached_property
+    def training_config(self):
         """学習設定を初期化"""
         return {
-            'batch_size': int(os.getenv("TRAINING_BATCH_SIZE", "32")),
-            'epochs': int(os.getenv("TRAINING_EPOCHS", "10")),
-            'learning_rate': float(os.getenv("TRAINING_LEARNING_RATE", "0.001"))
+            'batch_size': int(self._env.get("TRAINING_BATCH_SIZE", "32")),
+            'epochs': int(self._env.get("TRAINING_EPOCHS", "10")),
+            'learning_rate': float(self._env.get("TRAINING_LEARNING_RATE", "0.001"))
         }
 
     def ensure_model_directories(self):
@@ -54,10 +78,24 @@ class Config:
             model_dir.mkdir(parents=True, exist_ok=True)
 
     def verify_model_paths(self):
-        """モデルパスの存在確認"""
+        """
+        モデルパスの存在確認
+        
+        親ディレクトリごとにos.scandirで1回だけ列挙し、
+        ファイル名の集合で存在を判定する
+        """
+        entries_by_dir = {}
         missing_models = []
         for model_type, path in self.model_paths.items():
-            if not Path(path).exists():
+            path = Path(path)
+            parent = path.parent
+            if parent not in entries_by_dir:
+                try:
+                    with os.scandir(parent) as entries:
+                        entries_by_dir[parent] = {entry.name for entry in entries}
+                except OSError:
+                    entries_by_dir[parent] = set()
+            if path.name not in entries_by_dir[parent]:
                 missing_models.append(model_type)
         return missing_models
 
@@ -78,11 +116,31 @@ class Config:
         print(f"SLACK_APP_TOKEN: {'設定されています' if self.slack_app_token else '設定されていません'}")
 
         print("\nAIモデルのパス:")
+        missing_models = set(self.verify_model_paths())
         for model_name, path in self.model_paths.items():
-            exists = Path(path).exists()
-            status = '存在します' if exists else '見つかりません'
+            status = '見つかりません' if model_name in missing_models else '存在します'
             print(f"{model_name}: {path} ({status})")
         
         print("\n学習設定:")
         for key, value in self.training_config.items():
-            print(f"{key}: {value}")
\ No newline at end of file
+            print(f"{key}: {value}")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_config():
+    """
+    プロセス内で共有するConfigインスタンスを取得
+    
+    .envの読み込みは初回呼び出し時の1回のみ行う
+    複数スレッドから同時に呼ばれても生成されるインスタンスは1つ
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = Config()
+    return _instance
+
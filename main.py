@@ -1,31 +1,32 @@
-from config import Config
+from config import get_config
 from models.task import Task
 from services.notion_service import NotionService
 from services.slack_service import SlackService
-from utils.text_parser import TextParser
-from datetime import datetime, timedelta
 import logging
 import threading
-import time
 
 class TaskBot:
     """タスク管理Botのメインクラス"""
     
-    def __init__(self):
+    def __init__(self, enable_priority_loop: bool = True, priority_update_interval: int = 3600):
         """
         Botの初期化
         設定の読み込みと各サービスの初期化を行う
+        
+        Args:
+            enable_priority_loop (bool): 優先度の自動更新を行うか
+            priority_update_interval (int): 優先度の更新間隔（秒）。テスト時は短く設定する
         """
         # ログ設定
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
-        # 優先度更新テスト用
-        # self.priority_update_interval = 30
+        self.enable_priority_loop = enable_priority_loop
+        self.priority_update_interval = priority_update_interval
         
         try:
             # 設定の読み込み
             self.logger.info("設定を読み込んでいます...")
-            self.config = Config()
+            self.config = get_config()
             self.config.debug_print()
             
             # Notionサービスの初期化
@@ -36,10 +37,9 @@ class TaskBot:
             self.logger.info("Slackサービスを初期化しています...")
             self.slack_service = SlackService(self.config, self.notion_service)
             
-            # テキストパーサーの準備
-            self.text_parser = TextParser()
-            
             # 優先度更新用のスレッド初期化
+            # 待機はEventで行い、stop()で即座に終了できるようにする
+            self._stop_event = threading.Event()
             self.priority_update_thread = threading.Thread(
                 target=self._priority_update_loop,
                 daemon=True
@@ -57,20 +57,29 @@ class TaskBot:
             self.logger.info("Botを起動しています...")
 
             # 優先度更新スレッドの開始
-            self.priority_update_thread.start()
-            self.logger.info("優先度自動更新を開始しました")
+            if self.enable_priority_loop:
+                self.priority_update_thread.start()
+                self.logger.info("優先度自動更新を開始しました")
             self.slack_service.start(self.config.slack_app_token)
             self.logger.info("Botの起動が完了しました")
         except Exception as e:
             self.logger.error(f"起動中にエラーが発生しました: {str(e)}")
             raise
 
+    def stop(self):
+        """
+        優先度更新ループを停止する
+        """
+        self._stop_event.set()
+        if self.priority_update_thread.is_alive():
+            self.priority_update_thread.join()
+
     def _priority_update_loop(self):
         """
         定期的に優先度を更新するループ処理
-        起動時に1回実行し、その後1時間ごとに実行
+        起動時に1回実行し、その後priority_update_interval秒ごとに実行
         """
-        while True:
+        while not self._stop_event.is_set():
             try:
                 self.logger.info("タスクの優先度を更新しています...")
                 result = self.notion_service.update_priorities()
@@ -86,39 +95,9 @@ class TaskBot:
             except Exception as e:
                 self.logger.error(f"優先度更新中にエラーが発生しました: {str(e)}")
             
-            # 次の更新まで1時間待機
-            self.logger.info("次の優先度更新は1時間後に実行されます")
-            time.sleep(3600)
-
-    # def _priority_update_loop(self):
-    #     """
-    #     定期的に優先度を更新するループ処理
-    #     テスト用に短い間隔で実行
-    #     """
-    #     while True:
-    #         try:
-    #             self.logger.info("\n=== 優先度更新処理開始 ===")
-    #             self.logger.info(f"実行時刻: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                
-    #             result = self.notion_service.update_priorities()
-                
-    #             if result["success"]:
-    #                 if result["updated_count"] > 0:
-    #                     self.logger.info(f"更新成功: {result['message']}")
-    #                 else:
-    #                     self.logger.info("更新対象のタスクはありませんでした")
-    #             else:
-    #                 self.logger.error(f"更新失敗: {result['message']}")
-                
-    #             self.logger.info("=== 優先度更新処理完了 ===\n")
-                    
-    #         except Exception as e:
-    #             self.logger.error(f"エラー発生: {str(e)}")
-            
-    #         # 次の更新まで待機
-    #         next_update = datetime.now() + timedelta(seconds=self.priority_update_interval)
-    #         self.logger.info(f"次回更新予定: {next_update.strftime('%H:%M:%S')}")
-    #         time.sleep(self.priority_update_interval)
+            # 次の更新まで待機（停止要求があれば即座に抜ける）
+            self.logger.info(f"次の優先度更新は{self.priority_update_interval}秒後に実行されます")
+            self._stop_event.wait(self.priority_update_interval)
 
 def main():
     """
@@ -9,15 +9,146 @@
 """
 import json
 import os
-from datetime import datetime
+import re
+from datetime import date, datetime
 import random
-from typing import List, Dict, Any
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Any, Iterator, Callable, Optional, Tuple
 import logging
 import calendar
+import numpy as np
+from models.ai.keywords import KeywordScanner
+
+try:
+    import orjson
+except ImportError:  # orjsonが無い環境では標準のjsonを使用
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# テンプレート内のプレースホルダ（{task}, {deadline}, {action}）
+TEMPLATE_FIELD_PATTERN = re.compile(r"\{(task|deadline|action)\}")
+
+# 優先度の強さ（値が大きいほど優先度が高い）
+_PRIORITY_RANK = {"高": 3, "中": 2, "低": 1}
+
+
+def _parse_iso_date(value: str) -> date:
+    """
+    YYYY-MM-DD形式の日付文字列を変換（strptimeより高速）
+    
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"不正な日付形式です: {value}")
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def _compile_template(template: str) -> Callable[[str, str, str], str]:
+    """
+    テンプレートを文章生成用の関数に変換
+    
+    テンプレートごとにf文字列を返す関数のソースを生成してコンパイルする
+    例: "{task}を{action}" -> lambda task, deadline, action: f"{task}を{action}"
+    """
+    parts = TEMPLATE_FIELD_PATTERN.split(template)
+    body = "".join(
+        "{" + part + "}" if i % 2 else part.replace("{", "{{").replace("}", "}}")
+        for i, part in enumerate(parts)
+    )
+    source = f"lambda task, deadline, action: f{body!r}"
+    return eval(compile(source, f"<template {template!r}>", "eval"), {})
+
+
+def _dumps(item: Any) -> bytes:
+    """1件のデータをUTF-8のJSONバイト列に変換"""
+    if orjson is not None:
+        return orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(item, ensure_ascii=False).encode('utf-8')
+
+
+class _JsonArrayWriter:
+    """
+    JSON配列を1件ずつファイルへ書き出すライター
+    
+    全件をメモリに保持せずに、load_dataで読めるJSON配列を出力する
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.file_path, 'wb')
+        self._file.write(b"[")
+        return self
+
+    def write(self, item: Dict[str, Any]):
+        self.write_encoded(_dumps(item))
+
+    def write_encoded(self, data: bytes):
+        """_dumpsで変換済みの1件を書き出す"""
+        self._file.write(b",\n  " if self.count else b"\n  ")
+        self._file.write(data)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.write(b"\n]" if self.count else b"]")
+        self._file.close()
+
+
+class _JsonLinesWriter(_JsonArrayWriter):
+    """
+    JSON Lines形式（1行1件）で書き出すライター
+    
+    学習・評価用の中間ファイル向け。load_dataは拡張子.jsonlで判別して読み込む
+    """
+
+    def __enter__(self):
+        self._file = open(self.file_path, 'wb')
+        return self
+
+    def write_encoded(self, data: bytes):
+        self._file.write(data)
+        self._file.write(b"\n")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+
+def load_notion_tasks() -> List[Dict[str, Any]]:
+    """
+    Notionからタスク一覧を取得し、学習データ生成用の辞書形式に変換
+    
+    DataManagerのtask_sourceとして使用する
+    
+    Returns:
+        List[Dict[str, Any]]: タスク情報のリスト（取得失敗時は空リスト）
+    """
+    from services.notion_service import NotionService
+    from config import get_config
+
+    result = NotionService(get_config()).list_tasks()
+    if not result["success"]:
+        logger.error(f"既存タスクの取得に失敗: {result['message']}")
+        return []
+
+    return [
+        {
+            "title": task.title,
+            "category": task.categories[0] if task.categories else None,
+            "priority": task.priority,
+            "due_date": task.due_date,
+            "status": task.status
+        }
+        for task in result["tasks"]
+    ]
+
 class DataManager:
     """
     学習データの生成・管理クラス
@@ -26,12 +157,32 @@ class DataManager:
     データ収集を組み合わせて、多様な学習データを作成
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        task_source: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            task_source: 既存タスクを返す関数（例: load_notion_tasks）
+                Noneの場合はテンプレートのみで学習データを生成
+            seed: 乱数シード（指定すると生成結果と分割が再現可能）
+        """
+        # 既存タスクの取得元（読み込みはexisting_tasksへの初回アクセス時）
+        self._task_source = task_source
+        # バックグラウンドでの先行読み込み（prefetch_existing_tasks参照）
+        self._prefetch: Optional[Future] = None
+
         # データ保存用ディレクトリの設定
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.data_dir = os.path.join(project_root, "data", "training")
         os.makedirs(self.data_dir, exist_ok=True)
 
+        # 学習データ生成用の乱数生成器（モジュール共有のrandomは使わない）
+        self._np_rng = np.random.default_rng(seed)
+        # 既存タスクの前処理用（バックグラウンドで動くため系列を分ける）
+        self._task_rng = random.Random(seed)
+
         # キーワード辞書
         self.category_keywords = {
             "数学": ["計算", "数式", "証明", "微分", "積分"],
@@ -46,16 +197,33 @@ class DataManager:
             "中": ["なるべく", "できれば", "そろそろ"],
             "低": ["余裕", "ゆっくり"]
         }
+
+        # 全キーワードをまとめた検出器（タイトルごとの走査は1回）
+        self._category_scanner = KeywordScanner(self.category_keywords)
+        self._priority_scanner = KeywordScanner(self.priority_keywords)
         
         # テンプレートの初期化
         self._init_templates()
 
-        # Notionから既存タスクを読み込み（エラー時は空リスト）
-        self.existing_tasks = []
-        try:
-            self.existing_tasks = self._load_existing_tasks()
-        except Exception as e:
-            logger.error(f"既存タスクの読み込みに失敗: {e}")
+    @cached_property
+    def existing_tasks(self) -> List[Dict[str, Any]]:
+        """前処理済みの既存タスク（初回アクセス時に読み込み）"""
+        if self._prefetch is not None:
+            return self._prefetch.result()
+        return self._load_existing_tasks()
+
+    def prefetch_existing_tasks(self):
+        """
+        既存タスクの読み込みをバックグラウンドで開始
+        
+        Notionへの問い合わせ待ちをテンプレート生成と重ねるため、
+        existing_tasksへのアクセス前に呼び出しておく
+        """
+        if self._task_source is None or self._prefetch is not None or "existing_tasks" in self.__dict__:
+            return
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._prefetch = executor.submit(self._load_existing_tasks)
+        executor.shutdown(wait=False)
 
     def _init_templates(self):
         """
@@ -119,6 +287,47 @@ class DataManager:
             "プログラミング": self._create_category_templates("プログラミング", ["実装", "開発", "コーディング"])
         }
 
+        # 一括サンプリング用の候補と確率（生成ループ外で一度だけ計算）
+        self._task_type_keys = list(self.task_types)
+        self._task_type_probs = np.array(list(self.task_types.values()))
+        self._task_type_probs /= self._task_type_probs.sum()
+
+        self._deadline_keys = list(self.deadline_patterns)
+        self._deadline_probs = np.array([p["weight"] for p in self.deadline_patterns.values()])
+        self._deadline_probs /= self._deadline_probs.sum()
+
+        self._deadline_days = np.array([p["days"] for p in self.deadline_patterns.values()])
+
+        # 優先度ごとのアクション候補と確率
+        self._priority_keys = list(self.actions)
+        self._action_keys = {priority: list(actions) for priority, actions in self.actions.items()}
+        self._action_probs = {}
+        for priority, actions in self.actions.items():
+            probs = np.array(list(actions.values()))
+            self._action_probs[priority] = probs / probs.sum()
+
+        # テンプレートを事前に文章生成関数へ変換しておき、生成時のformat解析を省く
+        # 各関数は(task, deadline, action)を受け取り文章を返す
+        self.compiled_templates = {
+            category: {
+                priority: [_compile_template(template) for template in templates]
+                for priority, templates in priority_templates.items()
+            }
+            for category, priority_templates in self.templates.items()
+        }
+
+        # 優先度ごとに全カテゴリのテンプレートを平坦化した(カテゴリ, テンプレート)リスト
+        # 各カテゴリのテンプレート数は同じため、一様選択でカテゴリも一様に選ばれる
+        flat_templates = {}
+        for category, priority_templates in self.compiled_templates.items():
+            for priority, templates in priority_templates.items():
+                flat_templates.setdefault(priority, []).extend(
+                    (category, compiled) for compiled in templates
+                )
+        # 生成ループでの参照用に、優先度の並び（_priority_keys）順のタプルにしておく
+        self._flat_templates = {priority: tuple(templates) for priority, templates in flat_templates.items()}
+        self._flat_templates_by_index = tuple(self._flat_templates[priority] for priority in self._priority_keys)
+
     def _create_category_templates(self, category: str, keywords: List[str]) -> Dict[str, List[str]]:
         """カテゴリごとのテンプレートを生成"""
         return {
@@ -147,36 +356,32 @@ class DataManager:
         }
     
     def _determine_priority_from_deadline(self, days: int) -> str:
-        """期限から優先度を決定"""
+        """期限から優先度を決定（2択は7:3の一様乱数1回で判定）"""
         if days <= 1:
             return "高"
         elif days <= 3:
-            return random.choices(["高", "中"], weights=[0.7, 0.3])[0]
+            return "高" if self._task_rng.random() < 0.7 else "中"
         elif days <= 7:
-            return random.choices(["中", "低"], weights=[0.7, 0.3])[0]
+            return "中" if self._task_rng.random() < 0.7 else "低"
         else:
             return "低"
 
     def _load_existing_tasks(self) -> List[Dict[str, Any]]:
         """
-        NotionServiceから既存のタスクを読み込む
+        task_sourceから既存のタスクを読み込む
         
         Returns:
             List[Dict[str, Any]]: 読み込んだタスクのリスト
-            失敗時は空リストを返す
+            task_source未指定または失敗時は空リストを返す
         """
+        if self._task_source is None:
+            return []
+
         try:
-            from services.notion_service import NotionService
-            from config import Config
-            
-            notion_service = NotionService(Config())
-            result = notion_service.list_tasks()
-            
-            if result["success"]:
-                tasks = result["tasks"]
-                processed_tasks = self._preprocess_notion_tasks(tasks)
-                logger.info(f"{len(processed_tasks)}件の既存タスクを読み込みました")
-                return processed_tasks
+            tasks = self._task_source()
+            processed_tasks = self._preprocess_notion_tasks(tasks)
+            logger.info(f"{len(processed_tasks)}件の既存タスクを読み込みました")
+            return processed_tasks
             
         except Exception as e:
             logger.error(f"既存タスクの読み込みに失敗: {e}")
@@ -194,6 +399,7 @@ class DataManager:
         4. カテゴリの推定（ない場合）
         """
         processed_tasks = []
+        today = datetime.now().date()
         
         for task in tasks:
             if not task.get("title"):  # タイトルがない場合はスキップ
@@ -210,8 +416,8 @@ class DataManager:
             # 日付情報の処理
             if processed_task["due_date"]:
                 try:
-                    due_date = datetime.strptime(processed_task["due_date"], "%Y-%m-%d")
-                    days_until = (due_date.date() - datetime.now().date()).days
+                    due_date = _parse_iso_date(processed_task["due_date"])
+                    days_until = (due_date - today).days
                     processed_task["days_until"] = days_until
                     processed_task["deadline_type"] = self._get_deadline_type(days_until)
                 except ValueError:
@@ -249,11 +455,15 @@ class DataManager:
     
     def _estimate_category_from_title(self, title: str) -> str:
         """タイトルからカテゴリを推定"""
+        category_matches = self._category_scanner.count(title)
+        if not category_matches:
+            return "その他"
+
         max_matches = 0
         best_category = "その他"
         
-        for category, keywords in self.category_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in title)
+        for category in self.category_keywords:
+            matches = category_matches[category]
             if matches > max_matches:
                 max_matches = matches
                 best_category = category
@@ -273,8 +483,9 @@ class DataManager:
         # キーワードベースの優先度
         keyword_priority = None
         title = task["title"].lower()
-        for priority, keywords in self.priority_keywords.items():
-            if any(keyword in title for keyword in keywords):
+        priority_matches = self._priority_scanner.count(title)
+        for priority in self.priority_keywords:
+            if priority_matches[priority]:
                 keyword_priority = priority
                 break
 
@@ -294,53 +505,68 @@ class DataManager:
         # 最終的な優先度の決定
         if keyword_priority:
             # キーワードと期限ベースの優先度を比較して、より高い方を採用
-            priority_levels = {"高": 3, "中": 2, "低": 1}
-            return max(
-                keyword_priority,
-                deadline_priority,
-                key=lambda x: priority_levels[x]
-            )
+            if _PRIORITY_RANK[keyword_priority] >= _PRIORITY_RANK[deadline_priority]:
+                return keyword_priority
+            return deadline_priority
         
         return deadline_priority
 
-    def _generate_template_based_data(self, num_samples: int) -> List[Dict[str, Any]]:
-        """テンプレートベースの学習データを生成"""
-        training_data = []
+    def _generate_template_based_data(self, num_samples: int) -> Iterator[Dict[str, Any]]:
+        """テンプレートベースの学習データを1件ずつ生成"""
+        # 各項目の乱数をまとめて生成
+        rng = self._np_rng
+        task_type_idx = rng.choice(len(self._task_type_keys), size=num_samples, p=self._task_type_probs)
+        deadline_idx = rng.choice(len(self._deadline_keys), size=num_samples, p=self._deadline_probs)
+        template_pos = rng.random(num_samples)
+
+        # 期限から優先度を一括決定（_determine_priority_from_deadlineと同じ規則）
+        days = self._deadline_days[deadline_idx]
+        tie_break = rng.random(num_samples) < 0.7
+        priority_idx = np.select(
+            [days <= 1, days <= 3, days <= 7],
+            [0, np.where(tie_break, 0, 1), np.where(tie_break, 1, 2)],
+            default=2
+        )
+
+        # 優先度ごとにアクションを一括選択
+        action_idx = np.empty(num_samples, dtype=np.intp)
+        for i, priority in enumerate(self._priority_keys):
+            mask = priority_idx == i
+            action_idx[mask] = rng.choice(
+                len(self._action_keys[priority]),
+                size=int(mask.sum()),
+                p=self._action_probs[priority]
+            )
         
-        for _ in range(num_samples):
+        # ループ内の参照をローカル変数とPythonのリストにまとめておく
+        task_type_keys = self._task_type_keys
+        deadline_keys = self._deadline_keys
+        priority_keys = self._priority_keys
+        action_keys = self._action_keys
+        flat_templates = self._flat_templates_by_index
+        days_list = days.tolist()
+
+        for i, (t_idx, d_idx, p_idx, a_idx, pos) in enumerate(zip(
+            task_type_idx.tolist(), deadline_idx.tolist(), priority_idx.tolist(),
+            action_idx.tolist(), template_pos.tolist()
+        )):
             # 基本情報の生成
-            category = random.choice(list(self.templates.keys()))
-            task_type = random.choices(
-                list(self.task_types.keys()),
-                weights=list(self.task_types.values())
-            )[0]
-            
-            # 期限の生成
-            deadline_pattern = random.choices(
-                list(self.deadline_patterns.keys()),
-                weights=[p["weight"] for p in self.deadline_patterns.values()]
-            )[0]
-            days_until = self.deadline_patterns[deadline_pattern]["days"]
+            task_type = task_type_keys[t_idx]
             
-            # 優先度の決定
-            priority = self._determine_priority_from_deadline(days_until)
+            # 期限と優先度
+            deadline_pattern = deadline_keys[d_idx]
+            days_until = days_list[i]
+            priority = priority_keys[p_idx]
             
-            # アクションの選択
-            action = random.choices(
-                list(self.actions[priority].keys()),
-                weights=list(self.actions[priority].values())
-            )[0]
+            # アクション
+            action = action_keys[priority][a_idx]
             
-            # テンプレートの選択と文章生成
-            template = random.choice(self.templates[category][priority.lower()])
-            text = template.format(
-                task=task_type,
-                deadline=deadline_pattern,
-                action=action
-            )
+            # カテゴリとテンプレートの選択、文章生成
+            templates = flat_templates[p_idx]
+            category, render = templates[int(pos * len(templates))]
+            text = render(task_type, deadline_pattern, action)
 
-            # データの追加
-            training_data.append({
+            yield {
                 "text": text,
                 "labels": {
                     "category": category,
@@ -348,28 +574,27 @@ class DataManager:
                     "deadline_type": deadline_pattern,
                     "days_until": days_until
                 }
-            })
-        
-        return training_data
+            }
 
-    def _generate_existing_based_data(self, num_samples: int) -> List[Dict[str, Any]]:
-        """既存タスクベースの学習データを生成"""
+    def _generate_existing_based_data(self, num_samples: int) -> Iterator[Dict[str, Any]]:
+        """既存タスクベースの学習データを1件ずつ生成"""
         if not self.existing_tasks:
-            return []
+            return
             
-        training_data = []
-        for _ in range(num_samples):
-            task = random.choice(self.existing_tasks)
+        # 使用するタスクをまとめて一様に選択
+        task_idx = self._np_rng.integers(len(self.existing_tasks), size=num_samples)
+        for i in task_idx:
+            task = self.existing_tasks[i]
             
             # テキストの生成
-            text = f"{task['title']}"
+            text_parts = [task['title']]
             if task.get('due_date'):
-                text += f"、期限は{task['due_date']}"
+                text_parts.append(f"期限は{task['due_date']}")
             if task.get('priority'):
-                text += f"、優先度{task['priority']}"
+                text_parts.append(f"優先度{task['priority']}")
+            text = "、".join(text_parts)
                 
-            # データの追加
-            training_data.append({
+            yield {
                 "text": text,
                 "labels": {
                     "category": task.get("category", "その他"),
@@ -377,36 +602,118 @@ class DataManager:
                     "deadline_type": task.get("deadline_type"),
                     "days_until": task.get("days_until")
                 }
-            })
+            }
+
+    def _generate_unique(
+        self,
+        generate: Callable[[int], Iterator[Dict[str, Any]]],
+        num_samples: int,
+        seen: set
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        テキストが重複しないデータを指定件数まで生成
         
-        return training_data
+        新しいテキストが1件も得られなくなった場合は件数未満で打ち切る
+        """
+        remaining = num_samples
+        while remaining > 0:
+            added = 0
+            for item in generate(remaining):
+                if item["text"] in seen:
+                    continue
+                seen.add(item["text"])
+                added += 1
+                yield item
+            if not added:
+                logger.warning(f"重複のないデータが不足しています（残り{remaining}件）")
+                return
+            remaining -= added
 
-    def generate_training_data(self, num_samples: int = 1000) -> List[Dict[str, Any]]:
+    def _generate_existing_source(self, num_samples: int, unique: bool, seen: set) -> Iterator[Dict[str, Any]]:
         """
-        学習データを生成
+        既存タスクベースの学習データを生成するソース
+        
+        既存タスクへのアクセスは最初の1件を要求された時点まで遅らせる
+        （既存タスクが無い場合は何も出力しない）
+        """
+        if not self.existing_tasks:
+            return
+        if unique:
+            yield from self._generate_unique(self._generate_existing_based_data, num_samples, seen)
+        else:
+            yield from self._generate_existing_based_data(num_samples)
+
+    def iter_training_data(self, num_samples: int = 1000, unique: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        学習データを1件ずつ生成
         
         2つのソースからデータを生成:
         1. テンプレートベースのランダム生成
         2. 既存タスクからの変換
         
+        2つのソースのデータはランダムな順序で混ぜて出力する
+        
         Args:
             num_samples (int): 生成するサンプル数
+            unique (bool): Trueの場合、テキストが重複するデータを除外
             
-        Returns:
-            List[Dict[str, Any]]: 生成された学習データ
+        Yields:
+            Dict[str, Any]: 生成された学習データ
         """
-        training_data = []
+        # 既存タスクの読み込みを開始（既存タスクのデータが最初に必要になるまで、
+        # テンプレートベースのデータ生成と並行して進める）
+        self.prefetch_existing_tasks()
+
+        seen = set()
+        sources = []
 
         # テンプレートベースのデータ生成（80%）
         template_samples = int(num_samples * 0.8)
-        training_data.extend(self._generate_template_based_data(template_samples))
+        if unique:
+            template_data = self._generate_unique(self._generate_template_based_data, template_samples, seen)
+        else:
+            template_data = self._generate_template_based_data(template_samples)
+        sources.append((template_data, template_samples))
         
-        # 既存タスクからのデータ生成（20%）
-        if self.existing_tasks:
+        # 既存タスクからのデータ生成（20%、読み込み完了を待つのは最初の1件の出力時）
+        if self._task_source is not None or self.__dict__.get("existing_tasks"):
             existing_samples = num_samples - template_samples
-            training_data.extend(self._generate_existing_based_data(existing_samples))
+            existing_data = self._generate_existing_source(existing_samples, unique, seen)
+            sources.append((existing_data, existing_samples))
+
+        # ソースごとにまとまらないよう、ランダムな順序で混ぜて出力
+        yield from self._interleave(sources)
+
+    def _interleave(self, sources: List[Tuple[Iterator[Dict[str, Any]], int]]) -> Iterator[Dict[str, Any]]:
+        """
+        複数ソースのデータを件数の比率を保ったままランダムな順序で混ぜる
         
-        return training_data
+        Args:
+            sources: (データのイテレータ, 件数)のリスト
+        """
+        labels = np.repeat(np.arange(len(sources)), [count for _, count in sources])
+        self._np_rng.shuffle(labels)
+        iterators = [iter(source) for source, _ in sources]
+        for label in labels.tolist():
+            item = next(iterators[label], None)
+            if item is not None:
+                yield item
+        # 件数に達していないソースが残っていれば最後に出力
+        for iterator in iterators:
+            yield from iterator
+
+    def generate_training_data(self, num_samples: int = 1000, unique: bool = False) -> List[Dict[str, Any]]:
+        """
+        学習データを生成
+        
+        Args:
+            num_samples (int): 生成するサンプル数
+            unique (bool): Trueの場合、テキストが重複するデータを除外
+            
+        Returns:
+            List[Dict[str, Any]]: 生成された学習データ
+        """
+        return list(self.iter_training_data(num_samples, unique=unique))
 
     def save_data(self, data: List[Dict[str, Any]], filename: str):
         """
@@ -414,11 +721,19 @@ class DataManager:
         
         Args:
             data: 保存するデータ
-            filename: 保存先のファイル名
+            filename: 保存先のファイル名（拡張子.jsonlの場合はJSON Lines形式）
         """
         file_path = os.path.join(self.data_dir, filename)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if filename.endswith(".jsonl"):
+            with _JsonLinesWriter(file_path) as writer:
+                for item in data:
+                    writer.write(item)
+        elif orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         logger.info(f"データを保存しました: {file_path}")
 
     def load_data(self, filename: str) -> List[Dict[str, Any]]:
@@ -426,44 +741,84 @@ class DataManager:
         JSONファイルからデータを読み込み
         
         Args:
-            filename: 読み込むファイル名
+            filename: 読み込むファイル名（拡張子.jsonlの場合はJSON Lines形式）
             
         Returns:
             読み込んだデータ（ファイルが存在しない場合は空リスト）
         """
         file_path = os.path.join(self.data_dir, filename)
         if os.path.exists(file_path):
+            if filename.endswith(".jsonl"):
+                loads = orjson.loads if orjson is not None else json.loads
+                with open(file_path, 'rb') as f:
+                    return [loads(line) for line in f if line.strip()]
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         return []
 
-    def prepare_training_data(self):
+    def prepare_training_data(self, num_samples: int = 1000, unique: bool = False):
         """
         学習データの準備を行う
         
         処理の流れ:
-        1. 学習データの生成
-        2. 全データの保存
-        3. 学習用と評価用にデータを分割（8:2）
-        4. 分割したデータの保存
-        """
-        # 生成データの作成と保存
-        training_data = self.generate_training_data()
-        self.save_data(training_data, "training_data.json")
+        1. 学習データを1件ずつ生成
+        2. 全データファイル（JSON配列）と一時ファイルへ書き出し
+        3. 実際に生成された件数に対する乱数の並び替えで学習用と評価用に振り分け（8:2）、
+           一時ファイルから各ファイル（JSON Lines）へ書き出し
         
-        # データの分割（学習用と評価用）
-        random.shuffle(training_data)
-        split_point = int(len(training_data) * 0.8)  # 80%を学習用
+        全件をメモリに保持しないため、ピークメモリはサンプル数に依存しない
+        （生成件数はunique指定や既存タスクの有無でnum_samplesより少なくなる場合がある）
         
-        train_data = training_data[:split_point]
-        eval_data = training_data[split_point:]
-        
-        self.save_data(train_data, "train.json")
-        self.save_data(eval_data, "eval.json")
+        Args:
+            num_samples (int): 生成するサンプル数
+            unique (bool): Trueの場合、テキストが重複するデータを除外
+        """
+        with tempfile.TemporaryFile() as spool:
+            with _JsonArrayWriter(os.path.join(self.data_dir, "training_data.json")) as all_writer:
+                for item in self.iter_training_data(num_samples, unique=unique):
+                    data = _dumps(item)
+                    all_writer.write_encoded(data)
+                    spool.write(data)
+                    spool.write(b"\n")
+
+            # 生成された件数のうち、先頭80%の位置を学習用とする
+            count = all_writer.count
+            is_train = np.zeros(count, dtype=bool)
+            is_train[self._np_rng.permutation(count)[:int(count * 0.8)]] = True
+
+            spool.seek(0)
+            with _JsonLinesWriter(os.path.join(self.data_dir, "train.jsonl")) as train_writer, \
+                    _JsonLinesWriter(os.path.join(self.data_dir, "eval.jsonl")) as eval_writer:
+                for line, train in zip(spool, is_train.tolist()):
+                    if train:
+                        train_writer.write_encoded(line[:-1])
+                    else:
+                        eval_writer.write_encoded(line[:-1])
+
+        for writer in (all_writer, train_writer, eval_writer):
+            logger.info(f"データを保存しました: {writer.file_path}")
         
-        logger.info(f"学習データ: {len(train_data)}件")
-        logger.info(f"評価データ: {len(eval_data)}件")
+        logger.info(f"学習データ: {train_writer.count}件")
+        logger.info(f"評価データ: {eval_writer.count}件")
 
 if __name__ == "__main__":
-    manager = DataManager()
-    manager.prepare_training_data()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="学習データの生成")
+    parser.add_argument(
+        "--with-notion",
+        action="store_true",
+        help="Notionの既存タスクも学習データに含める"
+    )
+    parser.add_argument(
+        "--unique",
+        action="store_true",
+        help="テキストが重複する学習データを除外する"
+    )
+    args = parser.parse_args()
+
+    manager = DataManager(task_source=load_notion_tasks if args.with_notion else None)
+    manager.prepare_training_data(unique=args.unique)
\ No newline at end of file
@@ -1,11 +1,38 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import threading
 import numpy as np
 
+from ._kernels import cosine_matrix, cosine_pair, cosine_rows, quantize_rows
+
+# モデルごとに保持する埋め込みキャッシュの件数
+EMBEDDING_CACHE_SIZE = 4096
+# 参照テキスト群ごとに保持する正規化済み埋め込み行列の件数
+REFERENCE_CACHE_SIZE = 64
+
+@lru_cache(maxsize=None)
+def get_wakati_tagger():
+    """分かち書き用のMeCab Taggerを取得（全モデルで1つを共有）"""
+    import MeCab
+    return MeCab.Tagger("-Owakati")
+
+
+@lru_cache(maxsize=None)
+def get_pos_tagger():
+    """品詞付き形態素解析用のMeCab Taggerを取得（生成コストが高いため共有）"""
+    import MeCab
+    return MeCab.Tagger("-Ochasen")
+
+
 class BaseEmbeddingModel(ABC):
     """
     埋め込みモデルの基底クラス
     全ての埋め込みモデルはこのクラスを継承する
     """
+
+    # 推論中にGILを解放するか（Trueのモデルは他モデルと並行して計算される）
+    releases_gil = False
     
     def __init__(self, model_path: str):
         """
@@ -16,6 +43,16 @@ class BaseEmbeddingModel(ABC):
         self.model = None
         self.dimension = None
         self.load_model()
+        # 同じテキストの埋め込みを再計算しないようインスタンスごとにキャッシュ
+        self._embedding_cache = lru_cache(maxsize=EMBEDDING_CACHE_SIZE)(self._embed_readonly)
+        # 類似度計算用にL2正規化済みのベクトルもキャッシュ
+        self._normalized_cache = lru_cache(maxsize=EMBEDDING_CACHE_SIZE)(self._normalize_readonly)
+        # prefetch_embeddingsで一括計算し、まだキャッシュに入れていない埋め込み
+        # （モデルは複数スレッドで共有されるため、参照・更新はロック内で行う）
+        self._prefetched: Dict[str, np.ndarray] = {}
+        self._prefetch_lock = threading.Lock()
+        # 繰り返し比較される参照テキスト群の埋め込み行列
+        self._reference_cache = lru_cache(maxsize=REFERENCE_CACHE_SIZE)(self._reference_matrix)
     
     @abstractmethod
     def load_model(self):
@@ -23,9 +60,9 @@ class BaseEmbeddingModel(ABC):
         pass
     
     @abstractmethod
-    def get_embedding(self, text: str) -> np.ndarray:
+    def _compute_embedding(self, text: str) -> np.ndarray:
         """
-        テキストの埋め込みベクトルを取得
+        テキストの埋め込みベクトルを計算（キャッシュなし）
         
         Args:
             text (str): 入力テキスト
@@ -34,7 +71,154 @@ class BaseEmbeddingModel(ABC):
             np.ndarray: 埋め込みベクトル
         """
         pass
+
+    def _embed_readonly(self, text: str) -> np.ndarray:
+        """キャッシュ用に書き込み不可の埋め込みベクトルを計算"""
+        with self._prefetch_lock:
+            vector = self._prefetched.pop(text, None)
+        if vector is None:
+            vector = self._compute_embedding(text)
+        vector = np.asarray(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        return vector
+
+    def _normalize_readonly(self, text: str) -> np.ndarray:
+        """キャッシュ用に書き込み不可のL2正規化済みベクトルを計算"""
+        vector = self._normalize_rows(self.get_embedding(text))[0]
+        vector.setflags(write=False)
+        return vector
+
+    def get_normalized_embedding(self, text: str) -> np.ndarray:
+        """
+        L2正規化済みの埋め込みベクトルを取得
+        内積がそのままコサイン類似度になる（ゼロベクトルはゼロのまま）
+        
+        Args:
+            text (str): 入力テキスト
+            
+        Returns:
+            np.ndarray: 正規化済みの埋め込みベクトル（float32、書き込み不可）
+        """
+        return self._normalized_cache(text)
+
+    def get_embedding(self, text: str) -> np.ndarray:
+        """
+        テキストの埋め込みベクトルを取得
+        同じテキストはキャッシュ済みのベクトルを返す
+        
+        Args:
+            text (str): 入力テキスト
+            
+        Returns:
+            np.ndarray: 埋め込みベクトル（書き込み不可、float32）
+        """
+        return self._embedding_cache(text)
+    
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        複数テキストの埋め込みベクトルをまとめて取得
+        一括推論に対応したモデルはオーバーライドする
+        
+        Args:
+            texts (List[str]): 入力テキストのリスト
+            
+        Returns:
+            np.ndarray: (テキスト数, 次元数)の埋め込み行列
+        """
+        return np.stack([self.get_embedding(text) for text in texts])
     
+    def prefetch_embeddings(self, texts: List[str]):
+        """
+        複数テキストの埋め込みをget_embeddingsの一括推論でまとめて計算しておく
+        計算結果は各テキストの次回のget_embeddingで使用される
+        （一括推論に対応していないモデルでは何もしない）
+        
+        Args:
+            texts (List[str]): 入力テキストのリスト
+        """
+        if type(self).get_embeddings is BaseEmbeddingModel.get_embeddings:
+            return
+        embeddings = self.get_embeddings(texts)
+        with self._prefetch_lock:
+            self._prefetched.update(zip(texts, embeddings))
+
+    def discard_prefetched(self, texts: List[str]):
+        """
+        prefetch_embeddingsで計算したまま使用されなかった埋め込みを破棄
+        （他の呼び出しが一括計算した埋め込みは残す）
+        
+        Args:
+            texts (List[str]): prefetch_embeddingsに渡したテキストのリスト
+        """
+        with self._prefetch_lock:
+            for text in texts:
+                self._prefetched.pop(text, None)
+
+    def _reference_matrix(self, references: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        参照テキスト群のL2正規化済み埋め込みを(参照数, 次元数)の連続したint8行列にまとめる
+        
+        行ごとのスケールで対称に量子化する（元の行は int8行 * スケール で近似できる）
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (int8埋め込み行列, 行ごとのスケール)
+        """
+        embeddings = np.empty((len(references), self.dimension), dtype=np.float32)
+        for i, text in enumerate(references):
+            embeddings[i] = self.get_normalized_embedding(text)
+        matrix, scales = quantize_rows(embeddings)
+        matrix.setflags(write=False)
+        scales.setflags(write=False)
+        return matrix, scales
+
+    def cache_references(self, references: Tuple[str, ...]):
+        """
+        繰り返し比較する参照テキスト群の埋め込み行列を事前に作成
+        
+        Args:
+            references (Tuple[str, ...]): get_similarities_batchのothersに渡す参照テキスト
+        """
+        self._reference_cache(tuple(references))
+
+    def get_similarities_batch(self, query: str, others: Tuple[str, ...]) -> np.ndarray:
+        """
+        1つのテキストと複数テキストの類似度をまとめて計算
+        queryの正規化済み埋め込み（キャッシュ済み）と、正規化してからint8に量子化した
+        参照行列の内積を1回のカーネル呼び出しで求める（ノルムの計算・除算は不要）
+        
+        Args:
+            query (str): 比較元のテキスト
+            others (Tuple[str, ...]): 比較先のテキスト（同じ組は行列をキャッシュ）
+            
+        Returns:
+            np.ndarray: othersの並び順のコサイン類似度
+        """
+        matrix, scales = self._reference_cache(tuple(others))
+        out = np.empty(len(others), dtype=np.float32)
+        cosine_rows(self.get_normalized_embedding(query), matrix, scales, out)
+        return out
+
+    def get_similarities_matrix(self, queries: List[str], others: Tuple[str, ...]) -> np.ndarray:
+        """
+        複数テキストと複数テキストの類似度行列をまとめて計算
+        queriesの正規化済み埋め込みを1つの行列にまとめ、量子化した参照行列との類似度を
+        1回のカーネル呼び出しで求める（get_similarities_batchをqueryごとに呼ぶのと同じ結果）
+        
+        Args:
+            queries (List[str]): 比較元のテキスト
+            others (Tuple[str, ...]): 比較先のテキスト（同じ組は行列をキャッシュ）
+            
+        Returns:
+            np.ndarray: (queriesの数, othersの数)のコサイン類似度
+        """
+        matrix, scales = self._reference_cache(tuple(others))
+        query_matrix = np.empty((len(queries), self.dimension), dtype=np.float32)
+        for i, query in enumerate(queries):
+            query_matrix[i] = self.get_normalized_embedding(query)
+        out = np.empty((len(queries), len(others)), dtype=np.float32)
+        cosine_matrix(query_matrix, matrix, scales, out)
+        return out
+
     @abstractmethod
     def get_similarity(self, text1: str, text2: str) -> float:
         """
@@ -60,8 +244,72 @@ class BaseEmbeddingModel(ABC):
         Returns:
             float: コサイン類似度
         """
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        if norm1 == 0 or norm2 == 0:
-            return 0
-        return np.dot(vec1, vec2) / (norm1 * norm2)
\ No newline at end of file
+        vec1 = np.ascontiguousarray(vec1, dtype=np.float32)
+        vec2 = np.ascontiguousarray(vec2, dtype=np.float32)
+        return cosine_pair(vec1, vec2)
+
+    def close(self):
+        """
+        キャッシュとモデル本体への参照を解放
+        
+        解放後は再度インスタンスを作成して使用する
+        """
+        self._embedding_cache.cache_clear()
+        self._normalized_cache.cache_clear()
+        self._reference_cache.cache_clear()
+        with self._prefetch_lock:
+            self._prefetched.clear()
+        self.model = None
+
+    @staticmethod
+    def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+        """各行をL2正規化したfloat32行列を返す（ゼロベクトルはそのまま）"""
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+# 読み込み済みモデルのプロセス内共有（(クラス, パス) -> [モデル, 参照数]）
+_MODEL_REGISTRY: Dict[Tuple[type, str], list] = {}
+_MODEL_REGISTRY_LOCK = threading.Lock()
+
+
+def acquire_model(model_class: type, model_path: str) -> BaseEmbeddingModel:
+    """
+    同じクラス・パスのモデルを全インスタンスで共有して取得
+    未読み込みの場合は読み込む（同時に呼ばれても読み込みは1回）
+    
+    Args:
+        model_class (type): BaseEmbeddingModelのサブクラス
+        model_path (str): モデルファイルのパス
+        
+    Returns:
+        BaseEmbeddingModel: 共有モデル（不要になったらrelease_modelを呼ぶ）
+    """
+    key = (model_class, model_path)
+    with _MODEL_REGISTRY_LOCK:
+        entry = _MODEL_REGISTRY.get(key)
+        if entry is None:
+            entry = _MODEL_REGISTRY[key] = [model_class(model_path), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_model(model: BaseEmbeddingModel):
+    """
+    acquire_modelで取得したモデルの参照を返却
+    最後の参照が返却されたモデルはcloseで解放する
+    """
+    with _MODEL_REGISTRY_LOCK:
+        key = (type(model), model.model_path)
+        entry = _MODEL_REGISTRY.get(key)
+        if entry is None or entry[0] is not model:
+            # 共有されていないモデルはそのまま解放
+            model.close()
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _MODEL_REGISTRY[key]
+    model.close()
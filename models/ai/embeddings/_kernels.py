@@ -0,0 +1,138 @@
+import numpy as np
+
+try:
+    from numba import njit, types
+except ImportError:  # numbaが無い環境ではNumPy実装を使用
+    njit = None
+
+try:
+    import simsimd
+except ImportError:  # simsimdが無い環境ではNumPy実装を使用
+    simsimd = None
+
+
+# quantize_rowsで1度に処理する行数（一時配列の大きさをこの行数分に抑える）
+QUANTIZE_BLOCK_ROWS = 65536
+
+
+def quantize_rows(matrix: np.ndarray):
+    """
+    行ごとのスケールでint8に量子化
+    
+    語彙全体の行列でも一時配列が大きくならないよう、行をブロックごとに処理する
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (int8行列, 行ごとのfloat32スケール)
+        元の行は int8行 * スケール で近似できる
+    """
+    matrix = np.asarray(matrix)
+    quantized = np.empty(matrix.shape, dtype=np.int8)
+    scales = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], QUANTIZE_BLOCK_ROWS):
+        end = start + QUANTIZE_BLOCK_ROWS
+        block = np.asarray(matrix[start:end], dtype=np.float32)
+        block_scales = np.abs(block).max(axis=1) / np.float32(127.0)
+        block_scales[block_scales == 0] = 1.0
+        quantized[start:end] = np.rint(block / block_scales[:, None])
+        scales[start:end] = block_scales
+    return quantized, scales
+
+
+def cosine_pair(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    2つのfloat32ベクトルのコサイン類似度を計算
+    simsimdがあればSIMDカーネル、なければnumbaのカーネルを使用する（ゼロベクトルを含む場合は0）
+    """
+    # カーネルは長さを検証しないため、np.dotと同様に形状の不一致はここで弾く
+    if a.shape != b.shape:
+        raise ValueError(f"形状が一致しません: {a.shape} と {b.shape}")
+
+    if simsimd is not None:
+        if not a.any() or not b.any():
+            return 0.0
+        # simsimdはコサイン距離（1 - 類似度）を返す
+        return 1.0 - float(simsimd.cosine(a, b))
+
+    if njit is not None:
+        return float(_cosine_pair_jit(a, b))
+
+    norm1 = np.linalg.norm(a)
+    norm2 = np.linalg.norm(b)
+    if norm1 == 0 or norm2 == 0:
+        return 0.0
+    return float(np.dot(a, b) / (norm1 * norm2))
+
+
+def _cosine_rows_numpy(q: np.ndarray, R: np.ndarray, scales: np.ndarray, out: np.ndarray) -> None:
+    """NumPyによる1ベクトルと各行のコサイン類似度（numba非導入時のフォールバック）"""
+    # 行列積（BLAS）は行数によって積和の順序が変わるため、行ごとに同じ値になるeinsumを使用
+    np.multiply(np.einsum("ij,j->i", R, q), scales, out=out)
+
+
+def _cosine_matrix_numpy(Q: np.ndarray, R: np.ndarray, scales: np.ndarray, out: np.ndarray) -> None:
+    """NumPyによる複数ベクトルと各行のコサイン類似度（numba非導入時のフォールバック）"""
+    # cosine_rowsと同じ値になるよう、ベクトルごとに同じ計算を行う
+    for b in range(Q.shape[0]):
+        _cosine_rows_numpy(Q[b], R, scales, out[b])
+
+
+if njit is not None:
+    def _readonly(dtype, ndim):
+        """書き込み不可の配列も受け付ける入力配列の型"""
+        return types.Array(dtype, ndim, "A", readonly=True)
+
+    # 型を明示してインポート時にコンパイルし（結果はディスクにキャッシュ）、
+    # 最初のメッセージでコンパイル待ちが発生しないようにする
+    _COSINE_ROWS_SIGNATURES = [
+        types.void(_readonly(types.float32, 1), _readonly(dtype, 2), _readonly(types.float32, 1), types.float32[::1])
+        for dtype in (types.int8, types.float32)
+    ]
+    _COSINE_MATRIX_SIGNATURES = [
+        types.void(_readonly(types.float32, 2), _readonly(dtype, 2), _readonly(types.float32, 1), types.float32[:, ::1])
+        for dtype in (types.int8, types.float32)
+    ]
+
+    @njit([types.float32(_readonly(types.float32, 1), _readonly(types.float32, 1))], fastmath=True, cache=True)
+    def _cosine_pair_jit(a, b):
+        """内積とノルムを1回のループでまとめて計算するコサイン類似度"""
+        s = 0.0
+        na = 0.0
+        nb = 0.0
+        for k in range(a.shape[0]):
+            s += a[k] * b[k]
+            na += a[k] * a[k]
+            nb += b[k] * b[k]
+        if na == 0.0 or nb == 0.0:
+            return 0.0
+        return s / (np.sqrt(na) * np.sqrt(nb))
+
+    # 埋め込みモデルのスレッドプールから同時に呼ばれるため並列化はしない
+    # （numbaのワークキュー層は複数スレッドからの並列カーネル起動に対応していない）
+    @njit(_COSINE_ROWS_SIGNATURES, fastmath=True, cache=True)
+    def cosine_rows(q, R, scales, out):
+        """
+        L2正規化済みのベクトルqと、正規化済みの行を持つ行列Rの各行の
+        コサイン類似度（内積 * 行のスケール）を計算しoutに書き込む
+        Rはfloat32（scalesは1）またはquantize_rowsで量子化したint8を受け付ける
+        """
+        for i in range(R.shape[0]):
+            s = 0.0
+            for k in range(R.shape[1]):
+                s += R[i, k] * q[k]
+            out[i] = s * scales[i]
+
+    @njit(_COSINE_MATRIX_SIGNATURES, fastmath=True, cache=True)
+    def cosine_matrix(Q, R, scales, out):
+        """
+        L2正規化済みのベクトルを行に持つQの各行と、行列Rの各行のコサイン類似度を計算し
+        out[b, i]に書き込む（各要素はcosine_rowsと同じ順序で積和を求める）
+        """
+        for b in range(Q.shape[0]):
+            for i in range(R.shape[0]):
+                s = 0.0
+                for k in range(R.shape[1]):
+                    s += R[i, k] * Q[b, k]
+                out[b, i] = s * scales[i]
+else:
+    cosine_rows = _cosine_rows_numpy
+    cosine_matrix = _cosine_matrix_numpy
@@ -1,8 +1,6 @@
-import fasttext
 import numpy as np
 from typing import List
-import MeCab
-from . import BaseEmbeddingModel
+from . import BaseEmbeddingModel, get_wakati_tagger
 
 class FastTextModel(BaseEmbeddingModel):
     """
@@ -14,11 +12,13 @@ class FastTextModel(BaseEmbeddingModel):
         Args:
             model_path (str): FastTextモデルファイルのパス
         """
-        self.tagger = MeCab.Tagger("-Owakati")
+        self.tagger = get_wakati_tagger()
         super().__init__(model_path)
     
     def load_model(self):
         """FastTextモデルの読み込み"""
+        import fasttext
+
         self.model = fasttext.load_model(self.model_path)
         # FastTextの出力次元は300固定
         self.dimension = 300
@@ -33,9 +33,9 @@ class FastTextModel(BaseEmbeddingModel):
         Returns:
             List[str]: 分かち書きされた単語リスト
         """
-        return self.tagger.parse(text).strip().split()
+        return self.tagger.parse(text).split()
     
-    def get_embedding(self, text: str) -> np.ndarray:
+    def _compute_embedding(self, text: str) -> np.ndarray:
         """
         テキストの埋め込みベクトルを取得
         
@@ -59,6 +59,7 @@ class FastTextModel(BaseEmbeddingModel):
         Returns:
             float: 類似度スコア（0-1）
         """
-        vec1 = self.get_embedding(text1)
-        vec2 = self.get_embedding(text2)
-        return self.cosine_similarity(vec1, vec2)
\ No newline at end of file
+        # 正規化済みベクトルの内積でコサイン類似度を求める
+        vec1 = self.get_normalized_embedding(text1)
+        vec2 = self.get_normalized_embedding(text2)
+        return float(np.dot(vec1, vec2))
\ No newline at end of file
@@ -1,29 +1,36 @@
-from laserembeddings import Laser
 import numpy as np
 from typing import List
-import MeCab
-from . import BaseEmbeddingModel
+from . import BaseEmbeddingModel, get_wakati_tagger
 
 class LaserModel(BaseEmbeddingModel):
     """
     LASERモデルを使用したテキスト埋め込み
     """
+
+    # Laserインスタンスは重いため全インスタンスで共有
+    _shared_laser = None
+    # PyTorchでの推論中はGILが解放される
+    releases_gil = True
     
     def __init__(self, model_path: str):
         """
         Args:
             model_path (str): LASERモデルファイルのパス
         """
-        self.tagger = MeCab.Tagger("-Owakati")
+        self.tagger = get_wakati_tagger()
         super().__init__(model_path)
     
     def load_model(self):
         """LASERモデルの読み込み"""
-        self.model = Laser()
+        if LaserModel._shared_laser is None:
+            from laserembeddings import Laser
+
+            LaserModel._shared_laser = Laser()
+        self.model = LaserModel._shared_laser
         # LASERの出力次元は1024固定
         self.dimension = 1024
     
-    def get_embedding(self, text: str) -> np.ndarray:
+    def _compute_embedding(self, text: str) -> np.ndarray:
         """
         テキストの埋め込みベクトルを取得
         
@@ -37,6 +44,18 @@ class LaserModel(BaseEmbeddingModel):
         embeddings = self.model.embed_sentences([text], lang='ja')
         return embeddings[0]
     
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        複数テキストの埋め込みベクトルを1回の推論でまとめて取得
+        
+        Args:
+            texts (List[str]): 入力テキストのリスト
+            
+        Returns:
+            np.ndarray: (テキスト数, 1024)の埋め込み行列
+        """
+        return self.model.embed_sentences(texts, lang='ja')
+    
     def get_similarity(self, text1: str, text2: str) -> float:
         """
         2つのテキスト間の類似度を計算
@@ -48,6 +67,7 @@ class LaserModel(BaseEmbeddingModel):
         Returns:
             float: 類似度スコア（0-1）
         """
-        vec1 = self.get_embedding(text1)
-        vec2 = self.get_embedding(text2)
-        return self.cosine_similarity(vec1, vec2)
\ No newline at end of file
+        # 正規化済みベクトルの内積でコサイン類似度を求める
+        vec1 = self.get_normalized_embedding(text1)
+        vec2 = self.get_normalized_embedding(text2)
+        return float(np.dot(vec1, vec2))
\ No newline at end of file
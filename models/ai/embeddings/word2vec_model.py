@@ -1,24 +1,28 @@
-from gensim.models import KeyedVectors
 import numpy as np
 from typing import List
-import MeCab
-from . import BaseEmbeddingModel
+from . import BaseEmbeddingModel, get_wakati_tagger
+from ._kernels import quantize_rows
 
 class Word2VecModel(BaseEmbeddingModel):
     """
     Word2Vecモデルを使用したテキスト埋め込み
     """
+
+    # 単語ベクトルをint8に量子化して保持する（メモリ使用量が約1/4になる）
+    quantize_vectors = True
     
     def __init__(self, model_path: str):
         """
         Args:
             model_path (str): Word2Vecモデルファイルのパス
         """
-        self.tagger = MeCab.Tagger("-Owakati")
+        self.tagger = get_wakati_tagger()
         super().__init__(model_path)
     
     def load_model(self):
         """Word2Vecモデルの読み込み"""
+        from gensim.models import KeyedVectors
+
         try:
             # バイナリ形式で読み込み
             self.model = KeyedVectors.load(self.model_path)
@@ -34,7 +38,22 @@ class Word2VecModel(BaseEmbeddingModel):
                 raise Exception(f"モデルの読み込みに失敗しました: {str(e)}")
         
         self.dimension = self.model.vector_size
+        self._vocab = self.model.key_to_index
+        
+        if self.quantize_vectors:
+            self._vectors, self._scales = quantize_rows(self.model.vectors)
+            # 元のfloat32行列は保持しない
+            self.model = None
+        else:
+            self._vectors, self._scales = self.model.vectors, None
     
+    def close(self):
+        """キャッシュと単語ベクトル行列を解放"""
+        super().close()
+        self._vectors = None
+        self._scales = None
+        self._vocab = {}
+
     def tokenize(self, text: str) -> List[str]:
         """
         テキストを分かち書きする
@@ -45,9 +64,9 @@ class Word2VecModel(BaseEmbeddingModel):
         Returns:
             List[str]: 分かち書きされた単語リスト
         """
-        return self.tagger.parse(text).strip().split()
+        return self.tagger.parse(text).split()
     
-    def get_embedding(self, text: str) -> np.ndarray:
+    def _compute_embedding(self, text: str) -> np.ndarray:
         """
         テキストの埋め込みベクトルを取得
         
@@ -57,20 +76,54 @@ class Word2VecModel(BaseEmbeddingModel):
         Returns:
             np.ndarray: 埋め込みベクトル（単語ベクトルの平均）
         """
-        words = self.tokenize(text)
-        word_vectors = []
+        # 語彙に含まれる単語のインデックスを集め、行列から一括で取り出して平均
+        vocab = self._vocab
+        indices = [vocab[word] for word in self.tokenize(text) if word in vocab]
         
-        for word in words:
-            try:
-                vector = self.model[word]
-                word_vectors.append(vector)
-            except KeyError:
-                continue
+        if not indices:
+            return np.zeros(self.dimension, dtype=np.float32)
+        
+        if self._scales is not None:
+            # 量子化済みの行をスケールで復元してから平均
+            rows = self._vectors[indices].astype(np.float32)
+            rows *= self._scales[indices, None]
+            return rows.mean(axis=0)
+        
+        return self._vectors[indices].mean(axis=0)
+    
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        複数テキストの埋め込みベクトルをまとめて取得
+        全テキストの単語ベクトルを1回で取り出し、テキストごとの平均をまとめて計算する
+        
+        Args:
+            texts (List[str]): 入力テキストのリスト
+            
+        Returns:
+            np.ndarray: (テキスト数, 次元数)の埋め込み行列（語彙に単語がないテキストはゼロベクトル）
+        """
+        vocab = self._vocab
+        indices = []
+        counts = []
+        for text in texts:
+            token_indices = [vocab[word] for word in self.tokenize(text) if word in vocab]
+            indices.extend(token_indices)
+            counts.append(len(token_indices))
+        
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        if not indices:
+            return embeddings
         
-        if not word_vectors:
-            return np.zeros(self.dimension)
+        rows = self._vectors[indices].astype(np.float32)
+        if self._scales is not None:
+            rows *= self._scales[indices, None]
         
-        return np.mean(word_vectors, axis=0)
+        # テキストごとの区間の先頭位置で区切って合計し、単語数で割る
+        counts = np.array(counts)
+        has_words = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts[has_words])[:-1]))
+        embeddings[has_words] = np.add.reduceat(rows, starts, axis=0) / counts[has_words, None]
+        return embeddings
     
     def get_similarity(self, text1: str, text2: str) -> float:
         """
@@ -83,6 +136,7 @@ class Word2VecModel(BaseEmbeddingModel):
         Returns:
             float: 類似度スコア（0-1）
         """
-        vec1 = self.get_embedding(text1)
-        vec2 = self.get_embedding(text2)
-        return self.cosine_similarity(vec1, vec2)
\ No newline at end of file
+        # 正規化済みベクトルの内積でコサイン類似度を求める
+        vec1 = self.get_normalized_embedding(text1)
+        vec2 = self.get_normalized_embedding(text2)
+        return float(np.dot(vec1, vec2))
\ No newline at end of file
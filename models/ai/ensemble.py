@@ -1,15 +1,71 @@
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Callable, ClassVar, Dict, Any, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import gc
+import re
+import threading
 import numpy as np
 import logging
 from datetime import datetime, timedelta
 from .embeddings.word2vec_model import Word2VecModel
 from .embeddings.fasttext_model import FastTextModel
 from .embeddings.laser_model import LaserModel
-from gensim.models import KeyedVectors
+from .embeddings import acquire_model, get_pos_tagger, release_model
 from models.task import Task
 
+# テキスト対ごとに保持する類似度キャッシュの件数
+SIMILARITY_CACHE_SIZE = 4096
+
+# 期限推定で比較する表現と日数
+DEADLINE_PATTERNS = {
+    "明日": 1,
+    "明後日": 2,
+    "今週中": 7,
+    "来週": 7,
+    "今月中": 30
+}
+
+# 期限表現がテキストにそのまま含まれるかを1回で検索するパターン（長い表現を優先）
+DEADLINE_PATTERN = re.compile("|".join(map(re.escape, sorted(DEADLINE_PATTERNS, key=len, reverse=True))))
+
+# 日付を示す文字・数字・読み（いずれも含まないテキストは期限の類似度計算を省略する）
+DEADLINE_MARKER_PATTERN = re.compile(r"[年月日週間後前]|\d|あした|あさって")
+
+# タイトル生成で除外する日付関連の表現（いずれかを含む単語を除外）
+TITLE_DATE_PATTERN = re.compile("|".join(map(re.escape, [
+    "月曜", "火曜", "水曜", "木曜", "金曜", "土曜", "日曜",
+    "来週", "今週", "明日", "明後日", "今月", "来月",
+    "まで", "までに", "日", "月", "年"
+])))
+
+# タイトル生成で除外する動詞の基本形
+TITLE_STOP_VERBS = frozenset({'する', 'やる', '行う', '実施'})
+
+# タイトル生成で除外するその他の不要語
+TITLE_STOP_WORDS = frozenset({'必要', '予定', 'こと', 'もの', 'ため', 'それ', 'そう', 'それぞれ', '提出'})
+
+# タイトル生成での品詞ごとの重み（その他の品詞は0.4）
+TITLE_POS_WEIGHTS = {
+    '名詞': 1.0,
+    '形容詞': 0.8,
+    '副詞': 0.6
+}
+
+# 重み合計に対する割合がこれ未満のモデルは結果への影響が小さいため使用しない
+MIN_MODEL_WEIGHT = 0.05
+
+# 入力テキストの代表ベクトルに使うモデルの優先順（計算コストの低い順）
+QUERY_MODEL_ORDER = ('fasttext', 'word2vec', 'laser')
+
 class EnsembleModel:
     """複数の埋め込みモデルを組み合わせたアンサンブルモデル"""
+
+    # モデル名と実装クラスの対応
+    MODEL_CLASSES: ClassVar[Dict[str, type]] = {
+        'word2vec': Word2VecModel,
+        'fasttext': FastTextModel,
+        'laser': LaserModel
+    }
     
     def __init__(self, model_paths: Dict[str, str], weights: Optional[Dict[str, float]] = None):
         """
@@ -27,24 +83,76 @@ class EnsembleModel:
         
         # モデルの初期化（遅延ロード）
         self.model_paths = model_paths
-        self.model_status = {name: False for name in ['word2vec', 'fasttext', 'laser']}
+        self.model_status = {name: False for name in self.MODEL_CLASSES}
+        # 読み込みに失敗したモデル（呼び出しごとの再試行を避ける）
+        self._failed_models = set()
+        # 読み込めたモデルの正規化済みの重み（_get_active_weights参照）
+        self._active_weights: Optional[Dict[str, float]] = None
+        # GILを解放するモデルを並行実行するスレッドプール（初回使用時に作成）
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # _active_weightsと_poolの作成・破棄を直列化するロック
+        # （複数のスレッドから同時に呼ばれても作成は1度だけ）
+        self._init_lock = threading.Lock()
+
+        # 比較用の参照テキスト（キーワードを連結したもの）は初期化時に1度だけ作成
+        # ラベルと参照テキストを並び順を揃えた別々のタプルで保持し、
+        # 各モデルは参照テキストのタプルごとに連続した埋め込み行列を作る
+        self._category_labels = tuple(Task.CATEGORY_KEYWORDS)
+        self._category_refs = tuple(
+            " ".join(Task.CATEGORY_KEYWORDS[category]) for category in self._category_labels
+        )
+        # カテゴリ名またはキーワードのいずれかを含むかを1回の検索で判定するパターン
+        self._category_patterns = {
+            category: re.compile("|".join(map(re.escape, [category, *Task.CATEGORY_KEYWORDS[category]])))
+            for category in Task.VALID_CATEGORIES
+        }
+        self._priority_labels = (Task.PRIORITY_HIGH, Task.PRIORITY_MEDIUM, Task.PRIORITY_LOW)
+        self._priority_refs = tuple(
+            " ".join(Task.PRIORITY_KEYWORDS[priority]) for priority in self._priority_labels
+        )
+        self._deadline_refs = tuple(DEADLINE_PATTERNS)
+        # reference_scoresで1回の類似度計算にまとめる参照テキスト（カテゴリ・優先度・期限の順）
+        self._all_refs = self._category_refs + self._priority_refs + self._deadline_refs
+        # 期限がテキストだけで決まる場合は期限の参照テキストを除いて計算する
+        self._non_deadline_refs = self._category_refs + self._priority_refs
+
+        # 推定時に参照する定数は初期化時に確定させておく
+        self._threshold = Task.CONFIDENCE["THRESHOLD"]
+        # 明示的に一致したカテゴリ数ごとの信頼度（基準値 + 一致カテゴリごとの増分、最大値で頭打ち）
+        self._explicit_confidences = tuple(
+            min(Task.CONFIDENCE["BASE"] + Task.CONFIDENCE["INCREMENT"] * count, Task.CONFIDENCE["MAX"])
+            for count in range(len(self._category_labels) + 1)
+        )
+
+        # 同じテキスト対の類似度を再計算しないようインスタンスごとにキャッシュ
+        self._similarity_cache = lru_cache(maxsize=SIMILARITY_CACHE_SIZE)(self._compute_similarity)
 
     def _load_model(self, model_name: str) -> bool:
         """モデルの遅延ロード"""
         if model_name in self.models:
             return True
+        if model_name in self._failed_models:
+            return False
             
+        model = None
         try:
-            model_classes = {
-                'word2vec': Word2VecModel,
-                'fasttext': FastTextModel,
-                'laser': LaserModel
-            }
-            self.models[model_name] = model_classes[model_name](self.model_paths[model_name])
+            # 同じパスのモデルは他のインスタンスと共有する
+            model = acquire_model(self.MODEL_CLASSES[model_name], self.model_paths[model_name])
+            # 固定の参照テキストは読み込み時にまとめて埋め込んでおく
+            # （参照テキストの行列はモデル側にキャッシュされ、共有先でも使われる）
+            for references in (
+                self._category_refs, self._priority_refs, self._deadline_refs,
+                self._all_refs, self._non_deadline_refs
+            ):
+                model.cache_references(references)
+            self.models[model_name] = model
             self.model_status[model_name] = True
             return True
         except Exception as e:
             self.logger.error(f"{model_name}モデルの読み込みに失敗: {str(e)}")
+            if model is not None:
+                release_model(model)
+            self._failed_models.add(model_name)
             return False
 
     def generate_title(self, text: str) -> Dict[str, Any]:
@@ -61,58 +169,39 @@ class EnsembleModel:
             # MeCabで形態素解析を実行
             words = self._tokenize_with_pos(text)
 
-            # 除外する日付関連の表現
-            date_patterns = [
-                "月曜", "火曜", "水曜", "木曜", "金曜", "土曜", "日曜",
-                "来週", "今週", "明日", "明後日", "今月", "来月",
-                "まで", "までに", "日", "月", "年"
-            ]
-            
             # 不要な表現を除去
-            filtered_words = []
-            for word, pos in words:
-                # 日付関連の表現をスキップ
-                if any(pattern in word for pattern in date_patterns):
-                    continue
-                # 助詞・助動詞を除去
-                if pos.startswith(('助詞', '助動詞')):
-                    continue
-                # 動詞の基本形を除去
-                if pos.startswith('動詞') and word in ['する', 'やる', '行う', '実施']:
-                    continue
-                # その他の不要語を除去
-                if word in ['必要', '予定', 'こと', 'もの', 'ため', 'それ', 'そう', 'それぞれ', '提出']:
-                    continue
-                    
-                filtered_words.append((word, pos))
+            # （日付関連の表現、助詞・助動詞、動詞の基本形、その他の不要語）
+            filtered_words = [
+                (word, pos) for word, pos in words
+                if not TITLE_DATE_PATTERN.search(word)
+                and not pos.startswith(('助詞', '助動詞'))
+                and not (pos.startswith('動詞') and word in TITLE_STOP_VERBS)
+                and word not in TITLE_STOP_WORDS
+            ]
 
             # 重要度計算
             word_scores = {}
-            for word, pos in filtered_words:
+            if filtered_words:
+                # 全単語対の類似度を行列でまとめて計算し、
+                # 各単語について自分と異なる単語との平均類似度を求める
+                words = [word for word, _ in filtered_words]
+                similarity_matrix = self._pairwise_similarities(words)
+                _, word_ids = np.unique(words, return_inverse=True)
+                others = word_ids[:, None] != word_ids[None, :]
+                other_counts = others.sum(axis=1)
+                avg_similarities = (
+                    np.where(others, similarity_matrix, 0.0).sum(axis=1)
+                    / np.maximum(other_counts, 1)
+                )
+
                 # 品詞による重み付け
-                base_weight = {
-                    '名詞': 1.0,
-                    '形容詞': 0.8,
-                    '副詞': 0.6
-                }.get(pos.split('-')[0], 0.4)
-                
-                # Word2Vecによる類似度計算
-                try:
-                    similarities = []
-                    for other_word, _ in filtered_words:
-                        if word != other_word:
-                            sim = self.get_similarity(word, other_word)
-                            similarities.append(sim)
-                    
-                    if similarities:
-                        avg_similarity = sum(similarities) / len(similarities)
-                        # 品詞の重みと類似度を組み合わせる
-                        word_scores[word] = avg_similarity * base_weight
-                    else:
-                        word_scores[word] = base_weight * 0.5
-                        
-                except KeyError:
-                    word_scores[word] = base_weight * 0.5
+                base_weights = np.array(
+                    [TITLE_POS_WEIGHTS.get(pos.split('-')[0], 0.4) for _, pos in filtered_words]
+                )
+                # 品詞の重みと類似度を組み合わせる（比較対象の単語がない場合は重みの半分）
+                scores = np.where(other_counts > 0, avg_similarities * base_weights, base_weights * 0.5)
+                # 同じ単語が複数回出現する場合は後の出現のスコアを使う
+                word_scores = dict(zip(words, scores.tolist()))
 
             if not word_scores:
                 return {"title": text[:50], "confidence": 0.3}
@@ -159,40 +248,156 @@ class EnsembleModel:
             List[Tuple[str, str]]: (単語, 品詞)のリスト
         """
         try:
-            import MeCab
-            mecab = MeCab.Tagger("-Ochasen")
-            node = mecab.parseToNode(text)
-            
-            results = []
-            while node:
-                if node.surface:  # 空文字列でない場合
-                    results.append((node.surface, node.feature.split(',')[0]))
-                node = node.next
-                
-            return results
+            # ChaSen形式の出力を一括で受け取り、行・列に分割する
+            # 列: 表層形, 読み, 原形, 品詞（ハイフン区切り）, 活用型, 活用形（EOS行は除外）
+            output = get_pos_tagger().parse(text)
+            return [
+                (columns[0], columns[3].split('-', 1)[0])
+                for columns in (line.split('\t') for line in output.splitlines())
+                if len(columns) > 3 and columns[0]
+            ]
         except Exception as e:
             self.logger.error(f"形態素解析エラー: {str(e)}")
             return [(text, '名詞')]  # フォールバック
 
     def get_similarity(self, text1: str, text2: str) -> float:
-        """テキスト間の類似度を計算"""
-        similarities = []
-        total_weight = 0
+        """テキスト間の類似度を計算（同じテキスト対はキャッシュ済みの値を返す）"""
+        return self._similarity_cache(text1, text2)
+
+    def _get_active_weights(self) -> Dict[str, float]:
+        """
+        読み込みに成功したモデルの重みを合計1に正規化して取得
+        
+        初回呼び出し時に全モデルの読み込みを試み、結果を保持する
+        重みが合計のMIN_MODEL_WEIGHT未満（0以下を含む）のモデルは読み込まない
+        """
+        active_weights = self._active_weights
+        if active_weights is not None:
+            return active_weights
+        with self._init_lock:
+            if self._active_weights is None:
+                configured_total = sum(weight for weight in self.weights.values() if weight > 0)
+                loaded = {
+                    model_name: weight for model_name, weight in self.weights.items()
+                    if weight > 0 and weight >= configured_total * MIN_MODEL_WEIGHT
+                    and self._load_model(model_name)
+                }
+                total_weight = sum(loaded.values())
+                self._active_weights = {
+                    model_name: weight / total_weight for model_name, weight in loaded.items()
+                } if total_weight else {}
+            return self._active_weights
+
+    def get_query_vector(self, text: str) -> Optional[np.ndarray]:
+        """
+        テキストのL2正規化済みベクトルを、読み込めたモデルのうち最も軽いもので取得
+        
+        Returns:
+            Optional[np.ndarray]: 正規化済みベクトル（有効なモデルがない場合はNone）
+        """
+        active_weights = self._get_active_weights()
+        for model_name in QUERY_MODEL_ORDER:
+            if model_name in active_weights:
+                return self.models[model_name].get_normalized_embedding(text)
+        return None
+
+    def prefetch_embeddings(self, texts: List[str]):
+        """
+        複数テキストの埋め込みを各モデルの一括推論でまとめて計算しておく
+        以降の推定では計算済みの埋め込みが使われる
+        """
+        for model_name in self._get_active_weights():
+            self.models[model_name].prefetch_embeddings(texts)
+
+    def discard_prefetched(self, texts: List[str]):
+        """prefetch_embeddingsで計算したまま使用されなかった埋め込みを破棄"""
+        for model in self.models.values():
+            model.discard_prefetched(texts)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """モデル並行実行用のスレッドプールを取得"""
+        pool = self._pool
+        if pool is not None:
+            return pool
+        with self._init_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=len(self.MODEL_CLASSES))
+            return self._pool
+
+    def _weighted_similarity(self, compute: Callable[[str], Any], fallback: Any) -> Any:
+        """
+        各モデルでの類似度を重み付き平均でまとめる
         
-        for model_name, weight in self.weights.items():
-            if self._load_model(model_name):
-                try:
-                    similarity = self.models[model_name].get_similarity(text1, text2)
-                    similarities.append(similarity * weight)
-                    total_weight += weight
-                except Exception as e:
-                    self.logger.warning(f"{model_name}での類似度計算エラー: {str(e)}")
+        Args:
+            compute: モデル名を受け取り、そのモデルでの類似度（数値または配列）を返す関数
+            fallback: 有効なモデルがない場合に返す値
+        """
+        active_weights = self._get_active_weights()
+
+        # GILを解放するモデルはスレッドプールで先に開始し、他のモデルと並行して計算
+        futures = {
+            model_name: self._get_pool().submit(compute, model_name)
+            for model_name in active_weights
+            if self.models[model_name].releases_gil
+        }
+
+        result = 0.0
+        used_weight = 0.0
         
-        if not total_weight:
+        for model_name, weight in active_weights.items():
+            try:
+                future = futures.get(model_name)
+                similarity = future.result() if future is not None else compute(model_name)
+                result = result + weight * similarity
+                used_weight += weight
+            except Exception as e:
+                self.logger.warning(f"{model_name}での類似度計算エラー: {str(e)}")
+        
+        if not used_weight:
             self.logger.warning("有効なモデルがありません。フォールバック値を返します。")
-            return 0.5  # デフォルトの信頼度を返す
+            return fallback
         
-        return sum(similarities) / total_weight if similarities else 0.0 # 0.0 ~ 1.0の範囲
+        # 計算に失敗したモデルがあった場合のみ重みを正規化し直す
+        return result if used_weight == 1.0 else result / used_weight
+
+    def _compute_similarity(self, text1: str, text2: str) -> float:
+        """テキスト間の類似度を各モデルの重み付き平均で計算（キャッシュなし）"""
+        return self._weighted_similarity(
+            lambda model_name: self.models[model_name].get_similarity(text1, text2),
+            0.5  # デフォルトの信頼度を返す
+        )
+
+    def _reference_similarities(self, text: str, references: Tuple[str, ...]) -> np.ndarray:
+        """
+        テキストと各参照テキストの類似度をまとめて計算
+        
+        モデルごとにget_similarities_batchで全参照との類似度を1回で求め、重み付き平均を取る
+        （get_similarityを参照テキストごとに呼ぶのと同じ結果）
+        
+        Returns:
+            np.ndarray: 参照テキストの並び順の類似度
+        """
+        return self._weighted_similarity(
+            lambda model_name: self.models[model_name].get_similarities_batch(text, references),
+            np.full(len(references), 0.5, dtype=np.float32)
+        )
+
+    def _pairwise_similarities(self, texts: List[str]) -> np.ndarray:
+        """
+        テキスト同士の類似度行列をまとめて計算
+        
+        モデルごとに正規化済み埋め込み行列の積を1回で求め、重み付き平均を取る
+        （get_similarityを全ての対で呼ぶのと同じ結果）
+        
+        Returns:
+            np.ndarray: (テキスト数, テキスト数)の類似度行列
+        """
+        def compute(model_name: str) -> np.ndarray:
+            model = self.models[model_name]
+            vectors = np.stack([model.get_normalized_embedding(text) for text in texts])
+            return vectors @ vectors.T
+        
+        return self._weighted_similarity(compute, np.full((len(texts), len(texts)), 0.5, dtype=np.float32))
 
     def estimate_category(self, text: str) -> Dict[str, Any]:
         """
@@ -202,105 +407,260 @@ class EnsembleModel:
             Dict[str, Any]: {
                 "categories": List[str],  # 検出されたカテゴリのリスト
                 "confidence": float,      # 全体の信頼度
-                "scores": Dict[str, float] # 各カテゴリの類似度スコア
+                "scores": Dict[str, float] # 各カテゴリの類似度スコア（明示的なカテゴリがある場合は空）
             }
         """
-        # 既存のカテゴリとの類似度計算
-        similarities = {
-            category: self.get_similarity(text, " ".join(keywords))
-            for category, keywords in Task.CATEGORY_KEYWORDS.items()
-        }
-        
-        if not similarities:
+        if not self._category_refs:
             return {
                 "categories": [],
                 "confidence": 0.0,
                 "scores": {}
             }
-            
-        # テキストに直接含まれるカテゴリを優先的に検出
+
+        # 明示的なカテゴリがある場合は類似度計算を省略してそれを使用
+        explicit_result = self._explicit_category(text)
+        if explicit_result is not None:
+            return explicit_result
+
+        # 明示的なカテゴリがない場合は類似度による推定を使用
+        # 既存のカテゴリとの類似度計算（全カテゴリをまとめて計算）
+        return self._category_from_scores(self._reference_similarities(text, self._category_refs))
+
+    def _explicit_category(self, text: str) -> Optional[Dict[str, Any]]:
+        """テキストに直接含まれるカテゴリの推定結果（含まれない場合はNone）"""
         explicit_categories = [
-            category for category in Task.VALID_CATEGORIES
-            if category in text or 
-            any(keyword in text for keyword in Task.CATEGORY_KEYWORDS[category])
+            category for category, pattern in self._category_patterns.items()
+            if pattern.search(text)
         ]
+        if not explicit_categories:
+            return None
+        return {
+            "categories": explicit_categories[:3],  # 最大3つまで
+            "confidence": self._explicit_confidences[len(explicit_categories)],
+            "scores": {}
+        }
 
-        # 明示的なカテゴリがある場合はそれを使用
-        if explicit_categories:
-            final_categories = explicit_categories[:3]  # 最大3つまで
-        else:
-            # 明示的なカテゴリがない場合は類似度による推定を使用
-            threshold = Task.CONFIDENCE["THRESHOLD"]
-            high_similarity_categories = [
-                category for category, score in sorted(
-                    similarities.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )
-                if score > threshold
-            ]
-            # 類似度による推定は最大2つまで
-            final_categories = high_similarity_categories[:2]
-            
-            # カテゴリが全く見つからない場合のフォールバック
-            if not final_categories:
-                best_category = max(similarities.items(), key=lambda x: x[1])[0]
-                final_categories = [best_category]
+    def _category_from_scores(self, scores: np.ndarray) -> Dict[str, Any]:
+        """カテゴリごとの類似度から推定結果を作成"""
+        categories = self._category_labels
+        # 類似度の上位2件（降順、同点は定義順）
+        top_indices = np.argsort(-scores, kind='stable')[:2]
+        top_scores = scores[top_indices]
+
+        # 類似度による推定は最大2つまで
+        final_categories = [
+            categories[i] for i in top_indices[top_scores > self._threshold].tolist()
+        ]
+        
+        # カテゴリが全く見つからない場合のフォールバック
+        if not final_categories:
+            final_categories = [categories[int(top_indices[0])]]
 
         return {
             "categories": final_categories,
-            "confidence": max(similarities.values()) if similarities else 0.0,
-            "scores": similarities
+            "confidence": float(top_scores[0]),
+            # ラベル順の配列から辞書を作るのは結果を返す時の1回だけ
+            "scores": dict(zip(categories, scores.tolist()))
         }
 
 
     def estimate_priority(self, text: str) -> Dict[str, Any]:
         """優先度を推定"""
-        similarities = {
-            Task.PRIORITY_HIGH: self.get_similarity(text, " ".join(Task.PRIORITY_KEYWORDS[Task.PRIORITY_HIGH])),
-            Task.PRIORITY_MEDIUM: self.get_similarity(text, " ".join(Task.PRIORITY_KEYWORDS[Task.PRIORITY_MEDIUM])),
-            Task.PRIORITY_LOW: self.get_similarity(text, " ".join(Task.PRIORITY_KEYWORDS[Task.PRIORITY_LOW]))
-        }
-        
-        if not similarities:
+        if not self._priority_refs:
             return {"priority": "低", "confidence": 0.0}
-            
-        best_priority = max(similarities.items(), key=lambda x: x[1])
+
+        return self._priority_from_scores(self._reference_similarities(text, self._priority_refs))
+
+    def _priority_from_scores(self, scores: np.ndarray) -> Dict[str, Any]:
+        """優先度ごとの類似度から推定結果を作成"""
+        best = int(np.argmax(scores))
         return {
-            "priority": best_priority[0],
-            "confidence": best_priority[1],
-            "scores": similarities
+            "priority": self._priority_labels[best],
+            "confidence": float(scores[best]),
+            "scores": dict(zip(self._priority_labels, scores.tolist()))
         }
 
     def estimate_deadline(self, text: str) -> Dict[str, Any]:
-        """期限を推定"""
-        date_patterns = {
-            "明日": 1,
-            "明後日": 2,
-            "今週中": 7,
-            "来週": 7,
-            "今月中": 30
+        """
+        期限を推定
+        
+        期限表現がテキストにそのまま含まれる場合は類似度計算を省略してそれを使用し、
+        日付を示す表現を全く含まない場合は類似度計算を省略して期限なしとする
+        """
+        text_result = self._deadline_from_text(text)
+        if text_result is not None:
+            return text_result
+        return self._deadline_from_scores(self._reference_similarities(text, self._deadline_refs))
+
+    def _deadline_from_text(self, text: str) -> Optional[Dict[str, Any]]:
+        """テキストだけで決まる期限の推定結果（類似度計算が必要な場合はNone）"""
+        match = DEADLINE_PATTERN.search(text)
+        if match is not None:
+            return self._deadline_result(match.group(), 1.0)
+        if DEADLINE_MARKER_PATTERN.search(text) is None:
+            return {"deadline": None, "confidence": 0.0}
+        return None
+
+    def _deadline_from_scores(self, scores: np.ndarray) -> Dict[str, Any]:
+        """期限表現ごとの類似度から推定結果を作成"""
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+        
+        if similarity > self._threshold:
+            return self._deadline_result(self._deadline_refs[best], similarity)
+        
+        return {"deadline": None, "confidence": 0.0}
+
+    def _deadline_result(self, pattern: str, confidence: float) -> Dict[str, Any]:
+        """期限表現から推定結果を作成"""
+        days = DEADLINE_PATTERNS[pattern]
+        deadline_date = datetime.now() + timedelta(days=days)
+        return {
+            "deadline": deadline_date.strftime('%Y-%m-%d'),
+            "days": days,
+            "confidence": confidence,
+            "matched_pattern": pattern
         }
+
+    def analyze_all(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        カテゴリ・優先度・期限をまとめて推定
         
-        best_pattern = max(
-            date_patterns.items(),
-            key=lambda x: self.get_similarity(text, x[0])
-        )
-        similarity = self.get_similarity(text, best_pattern[0])
+        全ての参照テキストとの類似度を1回の計算で求めてから分割するため、
+        estimate_category・estimate_priority・estimate_deadlineを順に呼ぶのと同じ結果を
+        モデルごとに1回の呼び出しで得られる
         
-        if similarity > Task.CONFIDENCE["THRESHOLD"]:
-            deadline_date = datetime.now() + timedelta(days=best_pattern[1])
-            return {
-                "deadline": deadline_date.strftime('%Y-%m-%d'),
-                "days": best_pattern[1],
-                "confidence": similarity,
-                "matched_pattern": best_pattern[0]
+        Returns:
+            Dict[str, Dict[str, Any]]: {
+                "category": estimate_categoryの結果,
+                "priority": estimate_priorityの結果,
+                "deadline": estimate_deadlineの結果
             }
+        """
+        return self.analyze_with_scores(text, self.reference_scores([text])[0])
+
+    def reference_scores(self, texts: List[str]) -> np.ndarray:
+        """
+        複数テキストと全ての参照テキスト（カテゴリ・優先度・期限）との類似度をまとめて計算
         
-        return {"deadline": None, "confidence": 0.0}
+        モデルごとにget_similarities_matrixの1回の呼び出しで求め、重み付き平均を取る
+        期限がテキストだけで決まるテキスト（期限表現や日付を示す表現の有無で判定）は
+        期限の参照テキストとの類似度を計算せず、その列はNaNとする
+        
+        Args:
+            texts (List[str]): 入力テキストのリスト
+            
+        Returns:
+            np.ndarray: (テキスト数, 参照テキスト数)の類似度（各行はanalyze_with_scoresに渡す）
+        """
+        needs_deadline = np.array([self._deadline_from_text(text) is None for text in texts], dtype=bool)
+        deadline_texts = [text for text, needed in zip(texts, needs_deadline.tolist()) if needed]
+        other_texts = [text for text, needed in zip(texts, needs_deadline.tolist()) if not needed]
+
+        def compute(model_name: str) -> np.ndarray:
+            model = self.models[model_name]
+            scores = np.full((len(texts), len(self._all_refs)), np.nan, dtype=np.float32)
+            if deadline_texts:
+                scores[needs_deadline] = model.get_similarities_matrix(deadline_texts, self._all_refs)
+            if other_texts:
+                scores[~needs_deadline, :len(self._non_deadline_refs)] = model.get_similarities_matrix(
+                    other_texts, self._non_deadline_refs
+                )
+            return scores
+
+        return self._weighted_similarity(
+            compute,
+            np.full((len(texts), len(self._all_refs)), 0.5, dtype=np.float32)
+        )
+
+    def scores_cover(self, text: str, scores: np.ndarray) -> bool:
+        """
+        reference_scoresの1行（他のテキストのものを含む）でtextを推定できるか
+        
+        期限の類似度を計算していない行（NaNを含む行）は、期限がテキストだけで決まる場合のみ使える
+        """
+        return self._deadline_from_text(text) is not None or not np.isnan(scores).any()
+
+    def analyze_with_scores(self, text: str, scores: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """
+        reference_scoresで求めた類似度からカテゴリ・優先度・期限を推定
+        
+        明示的なカテゴリ・期限表現はtextから求め、類似度はそれ以外の推定にだけ使用する
+        
+        Args:
+            text (str): 入力テキスト
+            scores (np.ndarray): reference_scoresの結果のうちtextに対応する行
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: analyze_allと同じ形式の推定結果
+        """
+        category_info, deadline_info = self._estimates_from_text(text)
+        if category_info is not None:
+            scores = scores[len(self._category_refs):]
+        return self._estimates_from_scores(category_info, deadline_info, scores)
+
+    def _estimates_from_text(self, text: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        類似度計算なしで決まるカテゴリ・期限の推定結果
+        
+        Returns:
+            (カテゴリの推定結果またはNone, 期限の推定結果またはNone)
+            Noneの項目は類似度による推定が必要
+        """
+        if self._category_refs:
+            category_info = self._explicit_category(text)
+        else:
+            category_info = self.estimate_category(text)
+        return category_info, self._deadline_from_text(text)
+
+    def _estimates_from_scores(
+        self,
+        category_info: Optional[Dict[str, Any]],
+        deadline_info: Optional[Dict[str, Any]],
+        scores: np.ndarray
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        参照テキストとの類似度から残りの推定結果を作成
+        
+        scoresはカテゴリ（category_infoがNoneの場合のみ）・優先度・期限の参照テキストの順
+        """
+        if category_info is None:
+            category_count = len(self._category_refs)
+            category_info = self._category_from_scores(scores[:category_count])
+            scores = scores[category_count:]
+
+        priority_count = len(self._priority_refs)
+        if priority_count:
+            priority_info = self._priority_from_scores(scores[:priority_count])
+        else:
+            priority_info = {"priority": "低", "confidence": 0.0}
+
+        if deadline_info is None:
+            deadline_info = self._deadline_from_scores(scores[priority_count:])
+
+        return {
+            "category": category_info,
+            "priority": priority_info,
+            "deadline": deadline_info
+        }
 
     def cleanup(self) -> None:
         """メモリ解放"""
-        for model in self.models.values():
-            del model
-        self.models.clear()
\ No newline at end of file
+        with self._init_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        # 共有モデルの参照を返却し、最後の利用者であればキャッシュと重いバッファを解放する
+        # （解放に失敗したモデルがあっても残りのモデルは解放する）
+        for model_name, model in self.models.items():
+            try:
+                release_model(model)
+            except Exception as e:
+                self.logger.warning(f"{model_name}モデルの解放に失敗: {str(e)}")
+            self.model_status[model_name] = False
+        self.models.clear()
+        self._failed_models.clear()
+        with self._init_lock:
+            self._active_weights = None
+        self._similarity_cache.cache_clear()
+        gc.collect()
\ No newline at end of file
@@ -1,8 +1,21 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
+import copy
 import logging
-from datetime import datetime
+from datetime import date
+import threading
+import numpy as np
 from .ensemble import EnsembleModel
 
+# 解析結果キャッシュの件数（完全一致・類似テキストそれぞれ）
+ANALYSIS_CACHE_SIZE = 128
+# 類似テキストのキャッシュを使用する類似度の下限
+SEMANTIC_HIT_THRESHOLD = 0.86
+# 既存の代表ベクトルに統合する類似度の下限（未満の場合は新しく追加）
+SEMANTIC_MERGE_THRESHOLD = 0.70
+# analyze_textsで類似度行列を1回で計算するテキスト数の上限（メモリ使用量の抑制）
+ANALYSIS_BATCH_SIZE = 64
+
 class AIInference:
     """AIモデルを使用したテキスト解析インターフェース"""
     
@@ -13,63 +26,311 @@ class AIInference:
             weights (Optional[Dict[str, float]]): モデルの重み
         """
         self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
         
+        # 解析結果のキャッシュ（期限が日付に依存するため日付が変わったら破棄）
+        # Slackのリスナーは複数スレッドから呼ばれるため、キャッシュの参照・更新はロック内で行う
+        self._cache_lock = threading.Lock()
+        self._cache_date = date.today()
+        self._exact_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # 類似テキスト用: 代表ベクトル、対応する参照テキストとの類似度、統合件数、最終使用時刻
+        self._centroids: Optional[np.ndarray] = None
+        self._centroid_scores: List[np.ndarray] = []
+        self._centroid_counts: List[int] = []
+        self._centroid_last_used: List[int] = []
+        self._cache_clock = 0
+
         try:
             self.ensemble = EnsembleModel(model_paths, weights)
             self.logger.info("AIInference初期化完了")
         except Exception as e:
-            self.logger.error(f"AIInference初期化エラー: {str(e)}")
+            self.logger.error("AIInference初期化エラー: %s", e)
             raise
 
     def analyze_text(self, text: str, detailed: bool = False) -> Dict[str, Any]:
-        """テキストの総合的な分析を実行"""
+        """
+        テキストの総合的な分析を実行（analyze_textsに1件だけ渡した場合と同じ）
+        """
+        return self.analyze_texts([text], detailed)[0]
+
+    def analyze_texts(
+        self,
+        texts: List[str],
+        detailed: bool = False,
+        batch_size: int = ANALYSIS_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        複数テキストの分析をまとめて実行
+        
+        同じテキストの解析結果が当日中にあればそれを返す
+        （キャッシュには詳細を含めた結果を保持し、detailed=Falseの場合は詳細を除く）
+        十分に類似したテキストがあれば参照テキストとの類似度だけを再利用し、
+        タイトル・明示的なカテゴリ・期限表現はテキストから求め直す
+        
+        キャッシュにないテキストの埋め込みは各モデル1回の一括推論で先に計算し、
+        参照テキストとの類似度はbatch_size件ごとに1回のカーネル呼び出しで求める
+        
+        Args:
+            texts (List[str]): 入力テキストのリスト
+            detailed (bool): 詳細情報を含めるか
+            batch_size (int): 類似度行列を1回で計算するテキスト数
+            
+        Returns:
+            List[Dict[str, Any]]: textsの並び順の分析結果
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        with self._cache_lock:
+            self._expire_cache()
+            uncached = [text for text in unique_texts if text not in self._exact_cache]
+        results: Dict[str, Dict[str, Any]] = {}
         try:
-            self.logger.info(f"\n=== テキスト分析開始 ===")
-            self.logger.info(f"入力テキスト: {text}")
+            if len(uncached) > 1:
+                try:
+                    self.ensemble.prefetch_embeddings(uncached)
+                except Exception as e:
+                    self.logger.warning("埋め込みの一括計算エラー: %s", e)
+
+            # 類似テキストの類似度を再利用するテキストと、類似度を計算するテキストに分ける
+            reused = []
+            pending = []
+            for text in unique_texts:
+                result, scores, query_vector = self._lookup_cache(text)
+                if result is not None:
+                    results[text] = result
+                elif scores is not None:
+                    reused.append((text, scores, None))
+                else:
+                    pending.append((text, query_vector))
+
+            analyses = reused
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                try:
+                    chunk_scores = self.ensemble.reference_scores([text for text, _ in chunk])
+                except Exception as e:
+                    self.logger.error("類似度の一括計算エラー: %s", e)
+                    for text, _ in chunk:
+                        results[text] = self._get_fallback_result()
+                    continue
+                analyses.extend(
+                    (text, scores, query_vector)
+                    for (text, query_vector), scores in zip(chunk, chunk_scores)
+                )
+
+            for text, scores, query_vector in analyses:
+                result = self._analyze_text(text, scores, detailed=True)
+                if not result.get("error"):
+                    self._store_cache(text, query_vector, scores, result)
+                results[text] = result
+        finally:
+            # 他のスレッドが一括計算した埋め込みを消さないよう、このリストの分だけ破棄する
+            self.ensemble.discard_prefetched(uncached)
+
+        # 同じテキストが複数回ある場合も結果は別々のオブジェクトにする
+        outputs = []
+        returned = set()
+        for text in texts:
+            result = results[text]
+            if text in returned:
+                result = copy.deepcopy(result)
+            returned.add(text)
+            if not detailed:
+                result.pop("details", None)
+            outputs.append(result)
+        return outputs
+
+    def _lookup_cache(
+        self,
+        text: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        キャッシュから解析結果を検索
+        
+        Returns:
+            (同じテキストの結果またはNone,
+             類似テキストの参照テキストとの類似度またはNone,
+             入力テキストの正規化済みベクトルまたはNone)
+        """
+        with self._cache_lock:
+            self._expire_cache()
+            if text in self._exact_cache:
+                self._exact_cache.move_to_end(text)
+                self.logger.debug("解析結果のキャッシュを使用（完全一致）")
+                return copy.deepcopy(self._exact_cache[text]), None, None
+
+        # ベクトルの計算はロックの外で行う
+        try:
+            query_vector = self.ensemble.get_query_vector(text)
+        except Exception as e:
+            self.logger.warning("キャッシュ用ベクトルの計算エラー: %s", e)
+            return None, None, None
+        if query_vector is None:
+            return None, None, None
+
+        with self._cache_lock:
+            if self._centroids is None:
+                return None, None, query_vector
+            similarities = self._centroids @ query_vector
+            best = int(np.argmax(similarities))
+            if (
+                similarities[best] >= SEMANTIC_HIT_THRESHOLD
+                and self.ensemble.scores_cover(text, self._centroid_scores[best])
+            ):
+                self._cache_clock += 1
+                self._centroid_last_used[best] = self._cache_clock
+                self.logger.debug("類似度のキャッシュを使用（類似度: %.3f）", similarities[best])
+                return None, self._centroid_scores[best], query_vector
+        return None, None, query_vector
+
+    def _store_cache(
+        self,
+        text: str,
+        query_vector: Optional[np.ndarray],
+        scores: np.ndarray,
+        result: Dict[str, Any]
+    ):
+        """
+        解析結果をキャッシュに追加
+        
+        類似テキスト用には結果ではなく参照テキストとの類似度（scores）を保持する
+        （query_vectorがNoneの場合は同じテキスト用のキャッシュにのみ追加）
+        """
+        result = copy.deepcopy(result)
+        if query_vector is not None:
+            query_vector = np.asarray(query_vector, dtype=np.float32)
+            scores = np.array(scores, dtype=np.float32)
+
+        with self._cache_lock:
+            self._exact_cache[text] = result
+            if len(self._exact_cache) > ANALYSIS_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
+
+            if query_vector is None:
+                return
+
+            self._cache_clock += 1
+            if self._centroids is not None:
+                similarities = self._centroids @ query_vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= SEMANTIC_MERGE_THRESHOLD:
+                    # 近い代表ベクトルと類似度はどちらも統合したテキストの移動平均で更新する
+                    # （類似度は参照元から使われている可能性があるため新しい配列に置き換える）
+                    count = self._centroid_counts[best]
+                    centroid = self._centroids[best] * count + query_vector
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        self._centroids[best] = centroid / norm
+                    # 期限の類似度を計算していない（NaNの）列は他方の値を使う
+                    cached = self._centroid_scores[best]
+                    merged = (cached * count + scores) / (count + 1)
+                    self._centroid_scores[best] = np.where(
+                        np.isnan(cached), scores, np.where(np.isnan(scores), cached, merged)
+                    )
+                    self._centroid_counts[best] = count + 1
+                    self._centroid_last_used[best] = self._cache_clock
+                    return
+
+            if self._centroids is None:
+                self._centroids = query_vector[None, :].copy()
+            elif len(self._centroid_scores) < ANALYSIS_CACHE_SIZE:
+                self._centroids = np.vstack([self._centroids, query_vector])
+            else:
+                # 最も長く使われていない代表ベクトルを置き換える
+                oldest = int(np.argmin(self._centroid_last_used))
+                self._centroids[oldest] = query_vector
+                self._centroid_scores[oldest] = scores
+                self._centroid_counts[oldest] = 1
+                self._centroid_last_used[oldest] = self._cache_clock
+                return
+            self._centroid_scores.append(scores)
+            self._centroid_counts.append(1)
+            self._centroid_last_used.append(self._cache_clock)
+
+    def clear_cache(self):
+        """解析結果のキャッシュを破棄"""
+        with self._cache_lock:
+            self._reset_cache()
+
+    def _expire_cache(self):
+        """日付が変わっていればキャッシュを破棄（ロック内で呼ぶ）"""
+        if self._cache_date != date.today():
+            self._reset_cache()
+
+    def _reset_cache(self):
+        """キャッシュを空にする（ロック内で呼ぶ）"""
+        self._cache_date = date.today()
+        self._exact_cache.clear()
+        self._centroids = None
+        self._centroid_scores = []
+        self._centroid_counts = []
+        self._centroid_last_used = []
+
+    def _analyze_text(self, text: str, scores: np.ndarray, detailed: bool = False) -> Dict[str, Any]:
+        """
+        テキストの総合的な分析を実行（キャッシュなし）
+        
+        Args:
+            text (str): 入力テキスト
+            scores (np.ndarray): ensemble.reference_scoresで求めた参照テキストとの類似度
+            detailed (bool): 詳細情報を含めるか
+        """
+        try:
+            # ログ出力が無効な場合は文字列の整形自体を省略する
+            log_info = self.logger.isEnabledFor(logging.INFO)
+            log_scores = self.logger.isEnabledFor(logging.DEBUG)
+
+            if log_info:
+                self.logger.info("\n=== テキスト分析開始 ===")
+                self.logger.info("入力テキスト: %s", text)
 
             # タイトル生成を追加
-            self.logger.info("\n--- タイトル生成 ---")
             title_info = self.ensemble.generate_title(text)
-            self.logger.info(f"生成タイトル: {title_info['title']}")
-            self.logger.info(f"タイトル生成の信頼度: {title_info['confidence']:.3f}")
+            if log_info:
+                self.logger.info("\n--- タイトル生成 ---")
+                self.logger.info("生成タイトル: %s", title_info['title'])
+                self.logger.info("タイトル生成の信頼度: %.3f", title_info['confidence'])
             
-            # カテゴリ推定
-            self.logger.info("\n--- カテゴリ推定 ---")
-            category_info = self.ensemble.estimate_category(text)
-            self.logger.info(f"検出カテゴリ: {category_info['categories']}")
-            self.logger.info(f"カテゴリごとの類似度:")
-            for category, score in category_info.get("scores", {}).items():
-                self.logger.info(f"  - {category}: {score:.3f}")
-            self.logger.info(f"カテゴリ推定の信頼度: {category_info['confidence']:.3f}")
-
-            # 優先度推定
-            self.logger.info("\n--- 優先度推定 ---")
-            priority_info = self.ensemble.estimate_priority(text)
-            self.logger.info(f"判定された優先度: {priority_info['priority']}")
-            self.logger.info(f"優先度ごとの類似度:")
-            for priority, score in priority_info.get("scores", {}).items():
-                self.logger.info(f"  - {priority}: {score:.3f}")
-            self.logger.info(f"優先度推定の信頼度: {priority_info['confidence']:.3f}")
-
-            # 期限推定
-            self.logger.info("\n--- 期限推定 ---")
-            deadline_info = self.ensemble.estimate_deadline(text)
-            if deadline_info.get("deadline"):
-                self.logger.info(f"推定された期限: {deadline_info['deadline']}")
-                self.logger.info(f"マッチしたパターン: {deadline_info.get('matched_pattern')}")
-                self.logger.info(f"期限までの日数: {deadline_info.get('days')}日")
-            else:
-                self.logger.info("期限は指定されていません")
-            self.logger.info(f"期限推定の信頼度: {deadline_info.get('confidence', 0):.3f}")
+            # カテゴリ・優先度・期限の推定（類似度は計算済みのものを使用）
+            estimates = self.ensemble.analyze_with_scores(text, scores)
+            category_info = estimates["category"]
+            priority_info = estimates["priority"]
+            deadline_info = estimates["deadline"]
+
+            if log_info:
+                # カテゴリ推定
+                self.logger.info("\n--- カテゴリ推定 ---")
+                self.logger.info("検出カテゴリ: %s", category_info['categories'])
+                if log_scores:
+                    self.logger.debug("カテゴリごとの類似度:")
+                    for category, score in category_info.get("scores", {}).items():
+                        self.logger.debug("  - %s: %.3f", category, score)
+                self.logger.info("カテゴリ推定の信頼度: %.3f", category_info['confidence'])
+
+                # 優先度推定
+                self.logger.info("\n--- 優先度推定 ---")
+                self.logger.info("判定された優先度: %s", priority_info['priority'])
+                if log_scores:
+                    self.logger.debug("優先度ごとの類似度:")
+                    for priority, score in priority_info.get("scores", {}).items():
+                        self.logger.debug("  - %s: %.3f", priority, score)
+                self.logger.info("優先度推定の信頼度: %.3f", priority_info['confidence'])
+
+                # 期限推定
+                self.logger.info("\n--- 期限推定 ---")
+                if deadline_info.get("deadline"):
+                    self.logger.info("推定された期限: %s", deadline_info['deadline'])
+                    self.logger.info("マッチしたパターン: %s", deadline_info.get('matched_pattern'))
+                    self.logger.info("期限までの日数: %s日", deadline_info.get('days'))
+                else:
+                    self.logger.info("期限は指定されていません")
+                self.logger.info("期限推定の信頼度: %.3f", deadline_info.get('confidence', 0))
 
             # 総合結果の構築
-            confidence = self._calculate_confidence([
+            confidence = self._calculate_confidence(
                 title_info["confidence"],
                 category_info["confidence"],
                 priority_info["confidence"],
                 deadline_info.get("confidence", 0)
-            ])
+            )
             
             # 結果の構築
             result = {
@@ -88,24 +349,25 @@ class AIInference:
                     "deadline": deadline_info
                 }
 
-            self.logger.info("\n=== 分析結果 ===")
-            self.logger.info(f"タイトル: {result['title']}")
-            self.logger.info(f"カテゴリ: {result['categories']}")
-            self.logger.info(f"優先度: {result['priority']}")
-            self.logger.info(f"期限: {result['deadline'] or '指定なし'}")
-            self.logger.info(f"総合信頼度: {confidence:.3f}")
+            if log_info:
+                self.logger.info("\n=== 分析結果 ===")
+                self.logger.info("タイトル: %s", result['title'])
+                self.logger.info("カテゴリ: %s", result['categories'])
+                self.logger.info("優先度: %s", result['priority'])
+                self.logger.info("期限: %s", result['deadline'] or '指定なし')
+                self.logger.info("総合信頼度: %.3f", confidence)
             
             return result
             
         except Exception as e:
-            self.logger.error(f"テキスト分析エラー")
-            self.logger.error(f"エラー内容: {str(e)}")
+            self.logger.error("テキスト分析エラー")
+            self.logger.error("エラー内容: %s", e)
             return self._get_fallback_result()
     
     def _get_fallback_result(self) -> Dict[str, Any]:
         """エラー時のフォールバック結果"""
+        # titleは含めない（呼び出し側でルールベースのタイトルを使用させるため）
         return {
-            "title": "",
             "categories": [], 
             "priority": "中",
             "deadline": None,
@@ -113,27 +375,18 @@ class AIInference:
             "error": True
         }
 
-    def _calculate_confidence(self, scores: list) -> float:
-        """信頼度スコアの計算"""
-        return round(sum(scores) / len(scores), 3)
-
-    def _get_fallback_result(self) -> Dict[str, Any]:
-        """エラー時のフォールバック結果"""
-        return {
-            "categories": [], 
-            "priority": "中",
-            "deadline": None,
-            "confidence": 0.0,
-            "error": True
-        }
+    def _calculate_confidence(self, title: float, category: float, priority: float, deadline: float) -> float:
+        """信頼度スコアの計算（タイトル・カテゴリ・優先度・期限の信頼度の平均）"""
+        return round((title + category + priority + deadline) / 4, 3)
 
     def cleanup(self) -> None:
         """リソース解放"""
         try:
+            self.clear_cache()
             self.ensemble.cleanup()
             self.logger.info("リソースのクリーンアップ完了")
         except Exception as e:
-            self.logger.error(f"クリーンアップエラー: {str(e)}")
+            self.logger.error("クリーンアップエラー: %s", e)
 
     def __enter__(self):
         return self
@@ -0,0 +1,60 @@
+"""
+キーワード検出モジュール
+カテゴリ・優先度などのキーワード群を1回の走査でまとめて検出する
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List
+import re
+
+
+class KeywordScanner:
+    """グループごとのキーワードがテキストにいくつ含まれるかを1回の走査で数える"""
+
+    def __init__(self, keyword_groups: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keyword_groups (Dict[str, Iterable[str]]): グループ名とキーワードのリスト
+        """
+        # キーワードが属するグループ（同じキーワードが複数のグループ・複数回に現れる場合も数える）
+        groups_by_keyword: Dict[str, Counter] = {}
+        for group, keywords in keyword_groups.items():
+            for keyword in keywords:
+                groups_by_keyword.setdefault(keyword, Counter())[group] += 1
+
+        # 長いキーワードを優先した先読みで、各位置で一致する最長のキーワードを拾う
+        keywords = sorted(groups_by_keyword, key=len, reverse=True)
+        self._pattern = re.compile(
+            "(?=({}))".format("|".join(map(re.escape, keywords)))
+        ) if keywords else None
+
+        # 同じ位置で一致する短いキーワードは最長のものに含まれるため、
+        # 各キーワードに含まれるキーワードを事前に求めておく
+        self._contained: Dict[str, List[str]] = {
+            keyword: [other for other in keywords if other in keyword]
+            for keyword in keywords
+        }
+        self._groups_by_keyword = groups_by_keyword
+
+    def count(self, text: str) -> Counter:
+        """
+        テキストに含まれるキーワードの数をグループごとに数える
+        （`sum(1 for keyword in keywords if keyword in text)`をグループごとに求めるのと同じ結果）
+
+        Args:
+            text (str): 入力テキスト
+
+        Returns:
+            Counter: グループ名ごとの一致したキーワード数（一致がないグループは含まない）
+        """
+        if self._pattern is None:
+            return Counter()
+
+        found = set()
+        for hit in set(self._pattern.findall(text)):
+            found.update(self._contained[hit])
+
+        counts = Counter()
+        for keyword in found:
+            counts.update(self._groups_by_keyword[keyword])
+        return counts
@@ -4,10 +4,41 @@
 既存のTask、Ensemble、TextParserの設計を活用
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime
+from functools import lru_cache
 import logging
 from models.task import Task
+from .keywords import KeywordScanner
+
+# 優先度の表記ゆれを定数に変換するマッピング（定数変更対応、逆マッピングも含む）
+PRIORITY_MAPPING = {
+    "高": Task.PRIORITY_HIGH,
+    "中": Task.PRIORITY_MEDIUM,
+    "低": Task.PRIORITY_LOW,
+    "緊急": Task.PRIORITY_HIGH,
+    "通常": Task.PRIORITY_MEDIUM,
+    "低め": Task.PRIORITY_LOW,
+    Task.PRIORITY_HIGH: Task.PRIORITY_HIGH,
+    Task.PRIORITY_MEDIUM: Task.PRIORITY_MEDIUM,
+    Task.PRIORITY_LOW: Task.PRIORITY_LOW
+}
+
+# 有効な優先度
+VALID_PRIORITIES = frozenset({Task.PRIORITY_HIGH, Task.PRIORITY_MEDIUM, Task.PRIORITY_LOW})
+
+# 日数の昇順に並べた緊急度（最初に条件を満たしたものを採用する）
+URGENCY_BY_DAYS = tuple(sorted(Task.URGENCY_LEVELS.items(), key=lambda item: item[1]["days"]))
+
+# 期限が近いと警告する残り日数
+NEAR_DEADLINE_DAYS = 3
+
+
+@lru_cache(maxsize=4096)
+def _parse_ymd(value: str) -> date:
+    """YYYY-MM-DD形式の日付を解析（同じ文字列は解析結果を再利用、不正な形式はValueError）"""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
 
 class ResultValidator:
     """
@@ -19,8 +50,15 @@ class ResultValidator:
         self.logger = logging.getLogger(__name__)
         self.priority_keywords = Task.PRIORITY_KEYWORDS
         self.category_keywords = Task.CATEGORY_KEYWORDS
+        self._priority_scanner = KeywordScanner(self.priority_keywords)
+        # タイトル（小文字化済み）と比較するため、カテゴリのキーワードも事前に小文字化しておく
+        self._category_scanner = KeywordScanner({
+            category: [keyword.lower() for keyword in keywords]
+            for category, keywords in self.category_keywords.items()
+        })
         self.confidence_settings = Task.CONFIDENCE
         self.urgency_levels = Task.URGENCY_LEVELS
+        self._urgency_sorted = URGENCY_BY_DAYS
     
     def validate_results(
         self,
@@ -58,20 +96,19 @@ class ResultValidator:
             validated, rule_based, ai_result
         )
         
-        # 期限ベースの優先度調整と警告生成
+        # 期限ベースの優先度調整と警告生成（整合性の警告も同時に求める）
+        adjustment_warnings = []
         deadline_warnings = []
         if validated.get("due_date"):
-            priority_info = self._validate_deadline_priority(
+            validated["priority"], adjustment_warnings, deadline_warnings = self._deadline_audit(
                 validated["due_date"],
                 validated.get("priority", Task.PRIORITY_MEDIUM)
             )
-            validated["priority"] = priority_info["priority"]
-            deadline_warnings = priority_info["warnings"]
         
         # 整合性チェックと警告の統合
         validated["warnings"] = (
-            deadline_warnings +
-            self._check_consistency(validated)
+            adjustment_warnings +
+            self._check_consistency(validated, deadline_warnings)
         )
         
         return validated
@@ -109,92 +146,77 @@ class ResultValidator:
         due_date_value = None
         if due_date := rule_based.get("due_date"):
           try:
-              datetime.strptime(due_date, "%Y-%m-%d")
+              _parse_ymd(due_date)
               due_date_value = due_date
           except ValueError:
-              self.logger.warning(f"無効な期限フォーマット: {due_date}")
+              self.logger.warning("無効な期限フォーマット: %s", due_date)
 
         result["due_date"] = due_date_value
 
         # 優先度のバリデーション
         priority = rule_based.get("priority")
-        self.logger.debug(f"初期優先度: {priority}")
+        self.logger.debug("初期優先度: %s", priority)
         self.logger.debug(
-            f"Task優先度定数: HIGH={Task.PRIORITY_HIGH}, "
-            f"MEDIUM={Task.PRIORITY_MEDIUM}, LOW={Task.PRIORITY_LOW}"
+            "Task優先度定数: HIGH=%s, MEDIUM=%s, LOW=%s",
+            Task.PRIORITY_HIGH, Task.PRIORITY_MEDIUM, Task.PRIORITY_LOW
         )
 
-        # 優先度の変換マッピング（定数変更対応）
-        priority_mapping = {
-            "高": Task.PRIORITY_HIGH,
-            "中": Task.PRIORITY_MEDIUM,
-            "低": Task.PRIORITY_LOW,
-            "緊急": Task.PRIORITY_HIGH,
-            "通常": Task.PRIORITY_MEDIUM,
-            "低め": Task.PRIORITY_LOW,
-            # 逆マッピングも追加
-            Task.PRIORITY_HIGH: Task.PRIORITY_HIGH,
-            Task.PRIORITY_MEDIUM: Task.PRIORITY_MEDIUM,
-            Task.PRIORITY_LOW: Task.PRIORITY_LOW
-        }
-
         # タイトルからの優先度推定
         if result["title"]:
-            title_lower = result["title"].lower()
-            for priority_level, keywords in Task.PRIORITY_KEYWORDS.items():
-                if any(keyword in title_lower for keyword in keywords):
+            title_matches = self._priority_scanner.count(result["title"].lower())
+            for priority_level in Task.PRIORITY_KEYWORDS:
+                if title_matches[priority_level]:
                     priority = priority_level
-                    self.logger.debug(f"タイトルから優先度検出: {priority}")
+                    self.logger.debug("タイトルから優先度検出: %s", priority)
                     break
 
         # 優先度の決定ロジック
         if priority:
-            priority = priority_mapping.get(priority, Task.PRIORITY_MEDIUM)
-            self.logger.debug(f"優先度マッピング変換: {priority}")
+            priority = PRIORITY_MAPPING.get(priority, Task.PRIORITY_MEDIUM)
+            self.logger.debug("優先度マッピング変換: %s", priority)
         elif ai_result and ai_result.get("priority"):
-            priority = priority_mapping.get(ai_result["priority"], Task.PRIORITY_MEDIUM)
-            self.logger.debug(f"AI優先度採用: {priority}")
+            priority = PRIORITY_MAPPING.get(ai_result["priority"], Task.PRIORITY_MEDIUM)
+            self.logger.debug("AI優先度採用: %s", priority)
         else:
             priority = Task.PRIORITY_MEDIUM
-            self.logger.debug(f"デフォルト優先度採用: {priority}")
+            self.logger.debug("デフォルト優先度採用: %s", priority)
 
         # 現在の定数に基づいて検証
-        valid_priorities = {Task.PRIORITY_HIGH, Task.PRIORITY_MEDIUM, Task.PRIORITY_LOW}
-        self.logger.debug(f"有効な優先度: {valid_priorities}")
+        self.logger.debug("有効な優先度: %s", VALID_PRIORITIES)
         
         result["priority"] = (
-            priority if priority in valid_priorities
+            priority if priority in VALID_PRIORITIES
             else Task.PRIORITY_MEDIUM
         )
-        self.logger.debug(f"最終優先度: {result['priority']}")
+        self.logger.debug("最終優先度: %s", result["priority"])
 
         # カテゴリのバリデーション
         category = None
-        self.logger.debug(f"カテゴリ検証開始: title={rule_based.get('title')}")
+        self.logger.debug("カテゴリ検証開始: title=%s", rule_based.get("title"))
 
         # 1. ルールベースのカテゴリを最優先で確認
-        if rule_based.get("category") in Task.VALID_CATEGORIES:
+        if rule_based.get("category") in Task.VALID_CATEGORY_SET:
             category = rule_based["category"]
-            self.logger.debug(f"ルールベースのカテゴリを採用: {category}")
+            self.logger.debug("ルールベースのカテゴリを採用: %s", category)
         
         # 2. タイトルからカテゴリを推定
         elif rule_based.get("title"):
             title_lower = rule_based["title"].lower()
-            self.logger.debug(f"タイトルからカテゴリ推定: {title_lower}")
+            self.logger.debug("タイトルからカテゴリ推定: %s", title_lower)
             
-            for cat, keywords in Task.CATEGORY_KEYWORDS.items():
-                # キーワードを小文字に変換して比較
-                if any(keyword.lower() in title_lower for keyword in keywords):
+            title_matches = self._category_scanner.count(title_lower)
+            for cat in Task.CATEGORY_KEYWORDS:
+                if title_matches[cat]:
                     category = cat
-                    self.logger.debug(f"キーワードマッチ成功: カテゴリ={cat}")
+                    self.logger.debug("キーワードマッチ成功: カテゴリ=%s", cat)
                     break
 
         # 3. AIのカテゴリを確認
-        elif ai_result and ai_result.get("category") in Task.VALID_CATEGORIES:
+        elif ai_result and ai_result.get("category") in Task.VALID_CATEGORY_SET:
             category = ai_result["category"]
-            self.logger.debug(f"AIカテゴリを採用: {category}")
+            self.logger.debug("AIカテゴリを採用: %s", category)
 
-        self.logger.debug(f"最終カテゴリ: {category}")
+        self.logger.debug("最終カテゴリ: %s", category)
         result["category"] = category
         
         return result
@@ -234,66 +256,75 @@ class ResultValidator:
         
         return validated
     
-    def _validate_deadline_priority(
+    def _deadline_audit(
         self,
         due_date: str,
         current_priority: str
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, List[str], List[str]]:
         """
-        期限に基づく優先度の検証と調整
+        期限に基づく優先度の調整と整合性チェック
         
         検証ロジック:
-        1. 期限までの日数を計算
+        1. 期限までの日数を計算（日付の解析は1回だけ）
         2. Task.pyのurgency_levelsに基づいて優先度を判定
-        3. 現在の優先度と推奨優先度を比較
-        4. 必要に応じて警告を生成
+        3. 現在の優先度と推奨優先度を比較し、必要に応じて調整
+        4. 調整後の優先度と期限の整合性を確認
+        
+        Returns:
+            Tuple[str, List[str], List[str]]: (調整後の優先度, 優先度調整の警告, 期限に関する整合性の警告)
         """
         try:
-            deadline = datetime.strptime(due_date, "%Y-%m-%d").date()
-            days_until = (deadline - datetime.now().date()).days
-
-            # 期限切れの場合は即座に警告を生成
-            if days_until < 0:
-              return {
-                  "priority": Task.PRIORITY_HIGH,
-                  "warnings": [
-                      f"⚠️ 期限切れ（{abs(days_until)}日経過）のため、"
-                      f"優先度を「{current_priority}」から「{Task.PRIORITY_HIGH}」に変更しました"
-                  ]
-              }
-            
-            # Task.pyのurgency_levelsを利用
-            for level, info in self.urgency_levels.items():
-              if days_until <= info["days"]:
-                  suggested_priority = info["priority"]
-                  if suggested_priority != current_priority:
-                      return {
-                          "priority": suggested_priority,
-                          "warnings": [
-                              f"⚠️ {level}（残り{days_until}日）のため、"
-                              f"優先度を「{current_priority}」から「{suggested_priority}」に調整しました"
-                          ]
-                      }
-                  break
-            
-            return {
-                "priority": current_priority,
-                "warnings": []
-            }
-            
+            days_until = (_parse_ymd(due_date) - date.today()).days
         except ValueError:
-            return {
-                "priority": current_priority,
-                "warnings": ["⚠️ 期限の形式が正しくありません"]
-            }
+            return current_priority, ["⚠️ 期限の形式が正しくありません"], ["⚠️ 期限の形式が正しくありません"]
+
+        priority = current_priority
+        adjustment_warnings = []
+        consistency_warnings = []
+
+        # 期限切れの場合は優先度を高に変更
+        if days_until < 0:
+            priority = Task.PRIORITY_HIGH
+            adjustment_warnings.append(
+                f"⚠️ 期限切れ（{abs(days_until)}日経過）のため、"
+                f"優先度を「{current_priority}」から「{Task.PRIORITY_HIGH}」に変更しました"
+            )
+            consistency_warnings.append(
+                f"⚠️ このタスクは期限切れです（{abs(days_until)}日経過）"
+            )
+        
+        # 期限が近い場合
+        elif days_until <= NEAR_DEADLINE_DAYS:
+            consistency_warnings.append(
+                f"⚠️ 期限が近づいています（残り{days_until}日）"
+            )
+
+        # Task.pyのurgency_levelsを利用（調整と整合性チェックで同じ緊急度を使う）
+        for level, info in self._urgency_sorted:
+            if days_until <= info["days"]:
+                suggested_priority = info["priority"]
+                if days_until >= 0 and suggested_priority != priority:
+                    adjustment_warnings.append(
+                        f"⚠️ {level}（残り{days_until}日）のため、"
+                        f"優先度を「{priority}」から「{suggested_priority}」に調整しました"
+                    )
+                    priority = suggested_priority
+                if priority != suggested_priority:
+                    consistency_warnings.append(
+                        f"⚠️ {level}（残り{days_until}日）ですが、"
+                        f"優先度が「{suggested_priority}」になっていません"
+                    )
+                break
+
+        return priority, adjustment_warnings, consistency_warnings
     
-    def _check_consistency(self, data: Dict[str, Any]) -> List[str]:
+    def _check_consistency(self, data: Dict[str, Any], deadline_warnings: List[str]) -> List[str]:
         """
         データの整合性チェック
         
         チェック項目:
         1. 必須フィールドの存在確認
-        2. 期限と優先度の整合性
+        2. 期限と優先度の整合性（_deadline_auditで求めた警告を使用）
         3. カテゴリの設定確認
         """
         warnings = []
@@ -303,35 +334,8 @@ class ResultValidator:
             warnings.append("⚠️ タイトルが設定されていません")
         
         # 期限と優先度の整合性
-        if due_date := data.get("due_date"):
-            try:
-                deadline = datetime.strptime(due_date, "%Y-%m-%d").date()
-                days_until = (deadline - datetime.now().date()).days
-
-                # 期限切れの場合
-                if days_until < 0:
-                    warnings.append(
-                        f"⚠️ このタスクは期限切れです（{abs(days_until)}日経過）"
-                    )
-                
-                # 期限が近い場合
-                elif days_until <= 3:  # 3日以内を期限が近いと定義
-                    warnings.append(
-                        f"⚠️ 期限が近づいています（残り{days_until}日）"
-                    )
-                
-                # 優先度の整合性チェック
-                for level, info in self.urgency_levels.items():
-                    if days_until <= info["days"]:
-                        if data.get("priority") != info["priority"]:
-                            warnings.append(
-                                f"⚠️ {level}（残り{days_until}日）ですが、"
-                                f"優先度が「{info['priority']}」になっていません"
-                            )
-                        break
-                        
-            except ValueError:
-                warnings.append("⚠️ 期限の形式が正しくありません")
+        if data.get("due_date"):
+            warnings.extend(deadline_warnings)
         else:
             warnings.append("ℹ️ 期限が設定されていません")
         
@@ -26,11 +26,13 @@ class Task:
     STATUS_NOT_STARTED = "未着手"
     STATUS_IN_PROGRESS = "進行中"
     STATUS_COMPLETED = "完了"
+    VALID_STATUSES = frozenset({STATUS_NOT_STARTED, STATUS_IN_PROGRESS, STATUS_COMPLETED})
 
     # 優先度の定数
     PRIORITY_HIGH = "高"
     PRIORITY_MEDIUM = "中"
     PRIORITY_LOW = "低"
+    VALID_PRIORITIES = frozenset({PRIORITY_HIGH, PRIORITY_MEDIUM, PRIORITY_LOW})
     
     # 優先度定義
     PRIORITY_KEYWORDS = {
@@ -114,6 +116,8 @@ class Task:
     }
 
     VALID_CATEGORIES = list(CATEGORY_KEYWORDS.keys())
+    # メンバーシップ判定用（表示順が必要な場合はVALID_CATEGORIESを使用）
+    VALID_CATEGORY_SET = frozenset(VALID_CATEGORIES)
 
     def __init__(self, title, due_date=None, priority=None, categories=None, status="未着手", description=None):
         """
@@ -194,7 +198,7 @@ class Task:
         Raises:
             ValueError: 優先度が高/中/低のいずれかでない場合
         """
-        if value and value not in [self.PRIORITY_HIGH, self.PRIORITY_MEDIUM, self.PRIORITY_LOW]:
+        if value and value not in self.VALID_PRIORITIES:
             raise ValueError("優先度は '高'、'中'、'低' のいずれかを指定してください")
         self._priority = value
 
@@ -223,7 +227,7 @@ class Task:
             value = [value]
             
         # カテゴリの検証
-        invalid_categories = [cat for cat in value if cat not in self.VALID_CATEGORIES]
+        invalid_categories = [cat for cat in value if cat not in self.VALID_CATEGORY_SET]
         if invalid_categories:
             raise ValueError(
                 f"無効なカテゴリが指定されました: {', '.join(invalid_categories)}\n"
@@ -238,7 +242,7 @@ class Task:
 
     @status.setter
     def status(self, value):
-        if value not in [self.STATUS_NOT_STARTED, self.STATUS_IN_PROGRESS, self.STATUS_COMPLETED]:
+        if value not in self.VALID_STATUSES:
             raise ValueError("ステータスは '未着手'、'進行中'、'完了' のいずれかを指定してください")
         self._status = value
         self.updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -361,4 +365,4 @@ class Task:
         Returns:
             bool: 妥当な場合はTrue
         """
-        return status in [Task.STATUS_NOT_STARTED, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED]
\ No newline at end of file
+        return status in Task.VALID_STATUSES
\ No newline at end of file
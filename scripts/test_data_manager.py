@@ -0,0 +1,100 @@
+"""
+DataManagerのテストモジュール
+JSON/JSON Linesの保存と読み込み、テンプレートと既存タスクのデータの混在、
+学習用・評価用データの分割をテスト（ファイルは一時ディレクトリに書き出す）
+"""
+
+import unittest
+import json
+import os
+import tempfile
+from models.ai.data_manager import DataManager
+
+EXISTING_TASKS = [
+    {"title": f"数学の課題{i}", "due_date": "2030-12-01", "status": "未着手"}
+    for i in range(30)
+]
+
+
+class TestDataManager(unittest.TestCase):
+    """DataManagerのテストケース"""
+
+    def setUp(self):
+        """テストの前準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _create_manager(self, task_source=None, seed=1) -> DataManager:
+        """一時ディレクトリに書き出すDataManagerを作成"""
+        manager = DataManager(task_source=task_source, seed=seed)
+        manager.data_dir = self.temp_dir.name
+        return manager
+
+    def test_save_and_load(self):
+        """JSON配列・JSON Linesのどちらも保存した内容をそのまま読み込める"""
+        manager = self._create_manager()
+        data = manager.generate_training_data(50)
+        for filename in ("data.json", "data.jsonl"):
+            manager.save_data(data, filename)
+            self.assertEqual(manager.load_data(filename), data)
+
+        # JSON Linesは1行1件
+        with open(os.path.join(self.temp_dir.name, "data.jsonl"), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], data)
+        self.assertEqual(manager.load_data("missing.jsonl"), [])
+
+    def test_sources_are_interleaved(self):
+        """既存タスクのデータは件数の比率を保ったままテンプレートのデータと混ざる"""
+        data = self._create_manager(task_source=lambda: EXISTING_TASKS).generate_training_data(200)
+        sources = ["E" if "期限は2030-12-01" in item["text"] else "T" for item in data]
+        self.assertEqual(len(data), 200)
+        self.assertEqual(sources.count("E"), 40)
+        # ソースごとにまとめて出力されていない
+        self.assertIn("E", sources[:100])
+        self.assertIn("T", sources[100:])
+
+    def test_reproducible_with_seed(self):
+        """同じシードでは同じデータを生成する"""
+        first = self._create_manager(task_source=lambda: EXISTING_TASKS).generate_training_data(100)
+        second = self._create_manager(task_source=lambda: EXISTING_TASKS).generate_training_data(100)
+        self.assertEqual(first, second)
+
+    def test_unique(self):
+        """unique=Trueの場合はテキストが重複しない"""
+        data = self._create_manager(task_source=lambda: EXISTING_TASKS).generate_training_data(200, unique=True)
+        texts = [item["text"] for item in data]
+        self.assertEqual(len(texts), len(set(texts)))
+
+    def test_empty_task_source(self):
+        """既存タスクがない場合はテンプレートのデータだけを生成する"""
+        data = self._create_manager(task_source=lambda: []).generate_training_data(50)
+        self.assertEqual(len(data), 40)
+
+    def test_prepare_training_data_split(self):
+        """学習用・評価用データは実際に生成された件数の8:2に分割する"""
+        cases = [
+            (None, 1000, False, 800),
+            (lambda: EXISTING_TASKS, 1000, False, 1000),
+            (lambda: EXISTING_TASKS, 200, True, None),
+        ]
+        for task_source, num_samples, unique, expected_total in cases:
+            with self.subTest(num_samples=num_samples, unique=unique):
+                manager = self._create_manager(task_source=task_source)
+                manager.prepare_training_data(num_samples, unique=unique)
+                all_data = manager.load_data("training_data.json")
+                train_data = manager.load_data("train.jsonl")
+                eval_data = manager.load_data("eval.jsonl")
+
+                if expected_total is not None:
+                    self.assertEqual(len(all_data), expected_total)
+                self.assertEqual(len(train_data), int(len(all_data) * 0.8))
+                self.assertEqual(len(train_data) + len(eval_data), len(all_data))
+                # 全データが学習用・評価用のどちらか一方に入っている
+                self.assertEqual(
+                    sorted(map(json.dumps, all_data)),
+                    sorted(map(json.dumps, train_data + eval_data))
+                )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+"""
+AIInferenceの解析結果キャッシュのテストモジュール
+完全一致・類似テキストのキャッシュ、代表ベクトルの統合と置き換え、日付による破棄、
+analyze_textsの一括解析をテストする（埋め込みモデルは固定ベクトルを返す代替モデルを使用）
+"""
+
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+import zlib
+import numpy as np
+from models.ai import inference
+from models.ai.embeddings import BaseEmbeddingModel
+from models.ai.inference import AIInference
+
+DIMENSION = 16
+
+
+def _basis(*weights: float) -> np.ndarray:
+    """先頭の次元から順に重みを並べたベクトル"""
+    vector = np.zeros(DIMENSION, dtype=np.float32)
+    vector[:len(weights)] = weights
+    return vector
+
+
+class FixedEmbeddingModel(BaseEmbeddingModel):
+    """
+    テキストごとに決まったベクトルを返す埋め込みモデル
+    vectorsにないテキスト（参照テキストなど）はテキストから決まる乱数ベクトルを返す
+    """
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.computed = []
+        super().__init__("fixed")
+
+    def load_model(self):
+        self.dimension = DIMENSION
+
+    def _compute_embedding(self, text: str) -> np.ndarray:
+        self.computed.append(text)
+        if text in self.vectors:
+            return self.vectors[text]
+        rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+        return rng.standard_normal(DIMENSION)
+
+    def get_similarity(self, text1: str, text2: str) -> float:
+        return float(np.dot(self.get_normalized_embedding(text1), self.get_normalized_embedding(text2)))
+
+
+class TestInferenceCache(unittest.TestCase):
+    """AIInferenceのキャッシュのテストケース"""
+
+    def setUp(self):
+        """テストの前準備"""
+        self.vectors = {
+            "統計 レポート": _basis(1.0),
+            "統計 資料": _basis(1.0),
+            "統計 課題 明日": _basis(1.0),
+            "統計 宿題 来週": _basis(1.0),
+            "数学 証明": _basis(0.0, 1.0),
+            # 「数学 証明」との類似度は0.8（統合はするがヒットはしない）
+            "数学 演習": _basis(0.0, 0.8, 0.6),
+            "会議 準備": _basis(0.0, 0.0, 0.0, 1.0),
+            "会議 準備 3日後": _basis(0.0, 0.0, 0.0, 1.0),
+            "研究 発表": _basis(0.0, 0.0, 0.0, 0.0, 1.0),
+        }
+        self.ai = self._create_inference()
+        self.model = self.ai.ensemble.models["fasttext"]
+
+    def _create_inference(self) -> AIInference:
+        """代替の埋め込みモデルを使うAIInferenceを作成"""
+        ai = AIInference({}, weights={"fasttext": 1.0})
+        ai.ensemble.models = {"fasttext": FixedEmbeddingModel(self.vectors)}
+        # タイトル生成の形態素解析は空白区切りで代用
+        ai.ensemble._tokenize_with_pos = lambda text: [(word, "名詞") for word in text.split()]
+        return ai
+
+    def _count_scoring(self, ai: AIInference):
+        """reference_scoresの呼び出しを数えるモック"""
+        return mock.patch.object(ai.ensemble, "reference_scores", wraps=ai.ensemble.reference_scores)
+
+    def test_exact_hit(self):
+        """同じテキストは類似度を計算せずに同じ結果を返す"""
+        first = self.ai.analyze_text("統計 レポート")
+        with self._count_scoring(self.ai) as scoring:
+            second = self.ai.analyze_text("統計 レポート")
+        self.assertEqual(first, second)
+        scoring.assert_not_called()
+
+    def test_cached_result_is_isolated(self):
+        """返した結果を変更してもキャッシュには影響しない"""
+        first = self.ai.analyze_text("統計 レポート", detailed=True)
+        first["categories"].append("変更")
+        first["details"]["category"]["categories"].clear()
+
+        second = self.ai.analyze_text("統計 レポート", detailed=True)
+        self.assertNotIn("変更", second["categories"])
+        self.assertTrue(second["details"]["category"]["categories"])
+
+    def test_detailed_flag(self):
+        """キャッシュは詳細を保持し、detailed=Falseの場合は詳細を除いて返す"""
+        detailed = self.ai.analyze_text("統計 レポート", detailed=True)
+        plain = self.ai.analyze_text("統計 レポート")
+        again = self.ai.analyze_text("統計 レポート", detailed=True)
+        self.assertIn("details", detailed)
+        self.assertNotIn("details", plain)
+        self.assertEqual(detailed, again)
+
+    def test_semantic_hit_reuses_scores_only(self):
+        """類似テキストは類似度だけを再利用し、期限・タイトルはテキストから求める"""
+        tomorrow = self.ai.analyze_text("統計 課題 明日")
+        with self._count_scoring(self.ai) as scoring:
+            next_week = self.ai.analyze_text("統計 宿題 来週")
+        scoring.assert_not_called()
+        self.assertEqual(
+            tomorrow["deadline"],
+            (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        )
+        self.assertEqual(
+            next_week["deadline"],
+            (date.today() + timedelta(days=7)).strftime("%Y-%m-%d")
+        )
+        self.assertNotEqual(tomorrow["title"], next_week["title"])
+
+        # キャッシュを使わずに解析した結果と一致する
+        fresh = self._create_inference()
+        self.assertEqual(fresh.analyze_text("統計 宿題 来週"), next_week)
+
+    def test_semantic_hit_requires_deadline_scores(self):
+        """期限の類似度を計算していない類似度は、期限の推定が必要なテキストには使わない"""
+        self.ai.analyze_text("会議 準備")
+        self.assertTrue(np.isnan(self.ai._centroid_scores[0]).any())
+
+        with self._count_scoring(self.ai) as scoring:
+            result = self.ai.analyze_text("会議 準備 3日後")
+        scoring.assert_called_once()
+        # 統合後は期限の類似度も保持する
+        self.assertEqual(self.ai._centroid_counts, [2])
+        self.assertFalse(np.isnan(self.ai._centroid_scores[0]).any())
+
+        fresh = self._create_inference()
+        self.assertEqual(fresh.analyze_text("会議 準備 3日後"), result)
+
+    def test_centroid_merge(self):
+        """ヒットしないが近いテキストは代表ベクトルに統合する"""
+        self.ai.analyze_text("数学 証明")
+        scores = self.ai._centroid_scores[0].copy()
+        self.ai.analyze_text("数学 演習")
+
+        self.assertEqual(self.ai._centroid_counts, [2])
+        self.assertEqual(len(self.ai._centroid_scores), 1)
+        # 代表ベクトルは正規化された平均
+        expected = _basis(0.0, 1.8, 0.6)
+        np.testing.assert_allclose(self.ai._centroids[0], expected / np.linalg.norm(expected), rtol=1e-6)
+        # 類似度は2件の平均
+        merged = self.ai.ensemble.reference_scores(["数学 演習"])[0]
+        np.testing.assert_allclose(self.ai._centroid_scores[0], (scores + merged) / 2, rtol=1e-6)
+
+    def test_lru_eviction(self):
+        """件数の上限を超えたら最も長く使われていないものを破棄する"""
+        with mock.patch.object(inference, "ANALYSIS_CACHE_SIZE", 2):
+            self.ai.analyze_text("統計 レポート")
+            self.ai.analyze_text("数学 証明")
+            # 完全一致のキャッシュと（類似テキストで）代表ベクトルを使用済みにする
+            self.ai.analyze_text("統計 レポート")
+            self.ai.analyze_text("統計 資料")
+            self.ai.analyze_text("研究 発表")
+
+        self.assertEqual(list(self.ai._exact_cache), ["統計 資料", "研究 発表"])
+        self.assertEqual(len(self.ai._centroid_scores), 2)
+        # 「数学 証明」の代表ベクトルが置き換えられている
+        np.testing.assert_allclose(np.sort(self.ai._centroids.argmax(axis=1)), [0, 4])
+
+    def test_expires_on_date_change(self):
+        """日付が変わったらキャッシュを破棄する"""
+        self.ai.analyze_text("統計 レポート")
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.today() + timedelta(days=1)
+
+        with mock.patch.object(inference, "date", Tomorrow):
+            with self._count_scoring(self.ai) as scoring:
+                self.ai.analyze_text("統計 レポート")
+            scoring.assert_called_once()
+            self.assertEqual(self.ai._cache_date, Tomorrow.today())
+            self.assertEqual(list(self.ai._exact_cache), ["統計 レポート"])
+
+    def test_analyze_texts_matches_analyze_text(self):
+        """一括解析は1件ずつ解析した結果と一致し、重複テキストの結果は別のオブジェクトにする"""
+        texts = ["統計 レポート", "数学 証明", "統計 レポート", "研究 発表", "会議 準備 3日後"]
+        with self._count_scoring(self.ai) as scoring:
+            results = self.ai.analyze_texts(texts)
+        scoring.assert_called_once()
+
+        fresh = self._create_inference()
+        self.assertEqual(results, [fresh.analyze_text(text) for text in texts])
+        self.assertIsNot(results[0], results[2])
+        self.assertEqual(self.model._prefetched, {})
+
+    def test_clear_cache(self):
+        """clear_cacheで全てのキャッシュを破棄する"""
+        self.ai.analyze_text("統計 レポート")
+        self.ai.clear_cache()
+        self.assertEqual(len(self.ai._exact_cache), 0)
+        self.assertIsNone(self.ai._centroids)
+        self.assertEqual(self.ai._centroid_scores, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+KeywordScannerのテストモジュール
+キーワードを1つずつ検索する場合との一致、包含関係のあるキーワード、
+複数グループに属するキーワードをテスト
+"""
+
+import unittest
+import random
+from collections import Counter
+from models.ai.keywords import KeywordScanner
+from models.task import Task
+
+
+def naive_count(keyword_groups, text):
+    """キーワードを1つずつ検索して数える（KeywordScanner.countの期待値）"""
+    counts = Counter()
+    for group, keywords in keyword_groups.items():
+        count = sum(1 for keyword in keywords if keyword in text)
+        if count:
+            counts[group] = count
+    return counts
+
+
+class TestKeywordScanner(unittest.TestCase):
+    """KeywordScannerのテストケース"""
+
+    def test_matches_naive_count(self):
+        """Taskのキーワードでランダムなテキストを数えた結果が1つずつ検索した結果と一致する"""
+        for keyword_groups in (Task.CATEGORY_KEYWORDS, Task.PRIORITY_KEYWORDS):
+            scanner = KeywordScanner(keyword_groups)
+            keywords = [keyword for group in keyword_groups.values() for keyword in group]
+            rng = random.Random(0)
+            for _ in range(2000):
+                text = "".join(
+                    rng.choice(keywords + ["の", "を", "a"])
+                    for _ in range(rng.randint(0, 5))
+                )
+                self.assertEqual(scanner.count(text), naive_count(keyword_groups, text), text)
+
+    def test_overlapping_keywords(self):
+        """長いキーワードに含まれる短いキーワードも数える"""
+        keyword_groups = {
+            "A": ["レポート", "レポ"],
+            "B": ["レポート提出"],
+            "C": ["提出"]
+        }
+        scanner = KeywordScanner(keyword_groups)
+        for text in ["レポート提出", "レポ", "レポートを提出", "提出レポート提出", "なし"]:
+            self.assertEqual(scanner.count(text), naive_count(keyword_groups, text), text)
+        self.assertEqual(scanner.count("レポート提出"), Counter({"A": 2, "B": 1, "C": 1}))
+
+    def test_keyword_in_multiple_groups(self):
+        """複数のグループに属するキーワードはそれぞれのグループで数える"""
+        keyword_groups = {"A": ["統計", "確率"], "B": ["統計"]}
+        scanner = KeywordScanner(keyword_groups)
+        self.assertEqual(scanner.count("統計と確率"), Counter({"A": 2, "B": 1}))
+
+    def test_empty_keywords(self):
+        """キーワードがない場合は何も数えない"""
+        self.assertEqual(KeywordScanner({}).count("統計"), Counter())
+        self.assertEqual(KeywordScanner({"A": []}).count("統計"), Counter())
+
+if __name__ == '__main__':
+    unittest.main()
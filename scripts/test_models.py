@@ -49,9 +49,9 @@ class TestModels(unittest.TestCase):
     @staticmethod
     def _load_test_cases() -> Dict[str, Any]:
         """テストケースの読み込み"""
-        test_data_path = ROOT_DIR / 'data' / 'training' / 'eval.json'
+        test_data_path = ROOT_DIR / 'data' / 'training' / 'eval.jsonl'
         with open(test_data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            return [json.loads(line) for line in f if line.strip()]
 
     def setUp(self):
         """各テストケース実行前の準備"""
@@ -15,7 +15,7 @@ def main():
     manager.prepare_training_data()
 
     # データの確認
-    train_data = manager.load_data("train.json")
+    train_data = manager.load_data("train.jsonl")
     print(f"\n学習データの件数: {len(train_data)}")
     print("\nサンプルデータ:")
     for i in range(3):  # 最初の3件を表示
@@ -1,13 +1,56 @@
 from notion_client import Client
+import httpx
 from datetime import datetime, timedelta
+from operator import attrgetter
+import logging
+import time
 from models.task import Task
 
+logger = logging.getLogger(__name__)
+
+# タスク一覧キャッシュの有効期間（秒）
+LIST_CACHE_TTL = 30
+
+# Notion APIへの接続プール設定（Slackハンドラ間でTLS接続を再利用）
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+
+# ローカルソート用の優先度順位（未設定は最後）
+PRIORITY_RANK = {Task.PRIORITY_HIGH: 3, Task.PRIORITY_MEDIUM: 2, Task.PRIORITY_LOW: 1, None: 0}
+
+
+def _text_content(prop, kind):
+    """title/rich_textプロパティの先頭テキストを取得（未設定はNone）"""
+    items = (prop or {}).get(kind) or []
+    return items[0].get("text", {}).get("content") if items else None
+
+
+def _option_name(prop, kind):
+    """select/statusプロパティの選択肢名を取得（未設定はNone）"""
+    option = (prop or {}).get(kind)
+    return option.get("name") if option else None
+
+
+def _created_time(prop):
+    """作成日時プロパティ（作成日時型または日付型）の値を取得（未設定はNone）"""
+    prop = prop or {}
+    return prop.get("created_time") or (prop.get("date") or {}).get("start")
+
+
+def _task_sort_key(task):
+    """優先度の降順、期限の昇順（期限なしは最後）で並べるためのキー"""
+    return (-PRIORITY_RANK.get(task.priority, 0), task.due_date or "9999-12-31")
+
+
 class NotionService:
     """強化されたNotionサービスクラス"""
     
     def __init__(self, config):
-        self.client = Client(auth=config.notion_token)
+        # keep-alive接続を保持するHTTPクライアントを全リクエストで共有
+        self.http_client = httpx.Client(limits=HTTP_POOL_LIMITS)
+        self.client = Client(auth=config.notion_token, client=self.http_client)
         self.database_id = config.notion_database_id
+        # フィルター条件ごとのタスク一覧キャッシュ {キー: (取得時刻, 結果)}
+        self._list_cache = {}
 
     def add_task(self, task):
         """タスクを追加（エラーハンドリング強化）"""
@@ -43,6 +86,7 @@ class NotionService:
                 parent={"database_id": self.database_id},
                 properties=properties
             )
+            self._list_cache.clear()
 
             return {
                 "success": True,
@@ -66,6 +110,27 @@ class NotionService:
     def list_tasks(self, filters=None):
         """
         タスク一覧を取得（フィルタリング強化）
+        同じ条件での取得はLIST_CACHE_TTL秒間キャッシュを返す
+        
+        Args:
+            filters (dict, optional): フィルター条件
+            
+        Returns:
+            dict: 処理結果とタスク一覧
+        """
+        cache_key = tuple(sorted((filters or {}).items()))
+        cached = self._list_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < LIST_CACHE_TTL:
+            return cached[1]
+
+        result = self._fetch_task_list(filters)
+        if result["success"]:
+            self._list_cache[cache_key] = (time.monotonic(), result)
+        return result
+
+    def _fetch_task_list(self, filters=None):
+        """
+        Notionからタスク一覧を取得
         
         Args:
             filters (dict, optional): フィルター条件
@@ -74,14 +139,9 @@ class NotionService:
             dict: 処理結果とタスク一覧
         """
         try:
-            # クエリパラメータの構築
+            # クエリパラメータの構築（ソートは取得後にローカルで行う）
             query_params = {
-                "database_id": self.database_id,
-                "sorts": [
-                    {"property": "優先度", "direction": "descending"},
-                    {"property": "期限", "direction": "ascending"},
-                    {"property": "作成日時", "direction": "descending"}
-                ]
+                "database_id": self.database_id
             }
 
             # フィルターの構築
@@ -125,34 +185,31 @@ class NotionService:
                         "and": filter_conditions
                     }
 
-            # Notionにクエリを実行
-            response = self.client.databases.query(**query_params)
+            # Notionにクエリを実行（全ページ取得）
+            results = self._query_all(**query_params)
 
             # 結果が空の場合
-            if not response.get("results"):
+            if not results:
                 return {
                     "success": True,
                     "message": "タスクはありません",
                     "tasks": []
                 }
 
-            try:
-                # 結果を整形
-                tasks = []
-                for item in response["results"]:
-                    task = self._convert_notion_to_task(item)
-                    if task:
-                        tasks.append(task)
-                
-                # タスクの分類と整形
-                return self._format_task_list(tasks)
-                
-            except KeyError as ke:
-                return {
-                    "success": False,
-                    "message": f"データの形式が不正です: {str(ke)}",
-                    "tasks": None
-                }
+            # 結果を整形
+            tasks = []
+            for item in results:
+                task = self._convert_notion_to_task(item)
+                if task:
+                    tasks.append(task)
+
+            # 優先度・期限順に一括ソート（同じ優先度・期限は作成日時の新しい順）
+            # 安定ソートのため、先に作成日時で並べてから優先度・期限で並べ直す
+            tasks.sort(key=attrgetter("created_at"), reverse=True)
+            tasks.sort(key=_task_sort_key)
+            
+            # タスクの分類と整形
+            return self._format_task_list(tasks)
 
         except Exception as e:
             return {
@@ -161,6 +218,21 @@ class NotionService:
                 "tasks": None
             }
 
+    def _query_all(self, **query_params):
+        """
+        データベースクエリを全ページ分実行
+        
+        Returns:
+            list: 全ページの結果を連結したリスト
+        """
+        results = []
+        while True:
+            response = self.client.databases.query(**query_params)
+            results.extend(response.get("results", []))
+            if not response.get("has_more"):
+                return results
+            query_params["start_cursor"] = response["next_cursor"]
+
     def update_task_status(self, task_title, new_status):
         """タスクのステータスを更新"""
         try:
@@ -197,6 +269,7 @@ class NotionService:
                     "更新日時": {"date": {"start": datetime.now().strftime('%Y-%m-%d %H:%M:%S')}}
                 }
             )
+            self._list_cache.clear()
             
             return {
                 "success": True,
@@ -264,29 +337,44 @@ class NotionService:
         return None
 
     def _convert_notion_to_task(self, notion_item):
-        """NotionのデータをTaskオブジェクトに変換"""
-        props = notion_item["properties"]
+        """
+        NotionのデータをTaskオブジェクトに変換
         
-        title = props["タスク名"]["title"][0]["text"]["content"] if props["タスク名"]["title"] else None
-        status = props["ステータス"]["status"]["name"] if "ステータス" in props else Task.STATUS_NOT_STARTED
-        priority = props["優先度"]["select"]["name"] if "優先度" in props and props["優先度"]["select"] else None
-        due_date = props["期限"]["date"]["start"] if "期限" in props and props["期限"]["date"] else None
+        Taskとして不正な値（定義外の優先度・カテゴリ・ステータス、期限の形式）を持つページは
+        ページごとに1回警告を出してNoneを返す（一覧全体は失敗させない）
+        """
+        props = notion_item.get("properties", {})
+        
+        # 欠損したプロパティは既定値で補完（KeyErrorを発生させない）
+        title = _text_content(props.get("タスク名"), "title")
+        status = _option_name(props.get("ステータス"), "status") or Task.STATUS_NOT_STARTED
+        priority = _option_name(props.get("優先度"), "select")
+        due_date = ((props.get("期限") or {}).get("date") or {}).get("start")
 
         # 複数カテゴリの取得
-        categories = []
-        if "分野" in props and props["分野"]["multi_select"]:
-            categories = [item["name"] for item in props["分野"]["multi_select"]]
+        categories = [
+            item["name"] for item in (props.get("分野") or {}).get("multi_select") or []
+        ]
 
-        description = props["詳細"]["rich_text"][0]["text"]["content"] if "詳細" in props and props["詳細"]["rich_text"] else None
+        description = _text_content(props.get("詳細"), "rich_text")
         
-        return Task(
-            title=title,
-            due_date=due_date,
-            priority=priority,
-            categories=categories,
-            status=status,
-            description=description
-        )
+        try:
+            task = Task(
+                title=title,
+                due_date=due_date,
+                priority=priority,
+                categories=categories,
+                status=status,
+                description=description
+            )
+        except ValueError as e:
+            logger.warning("不正なタスクをスキップしました（ページID: %s）: %s", notion_item.get("id"), e)
+            return None
+        # 作成日時はNotion側の値を使用（ソートの同順位の並びに使う）
+        created_at = _created_time(props.get("作成日時")) or notion_item.get("created_time")
+        if created_at:
+            task.created_at = created_at
+        return task
 
     def _format_task_list(self, tasks):
         """タスク一覧の整形"""
@@ -367,6 +455,9 @@ class NotionService:
                             }
                         )
                         updated_count += 1
+
+            if updated_count:
+                self._list_cache.clear()
             
             return {
                 "success": True,
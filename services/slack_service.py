@@ -13,6 +13,9 @@ import logging
 from datetime import datetime, timedelta
 from models.chat_module import ChatModule
 
+# 明示的なタスク属性指定（例: | 期限:2024-03-20 | 優先度:高 | 分野:数学）
+TASK_TAG_PATTERN = re.compile(r"(期限|優先度|分野)\s*:\s*([^|]+)")
+
 
 class SlackService:
     """
@@ -37,6 +40,22 @@ class SlackService:
         "overdue": "期限切れタスクを表示"
     }
 
+    # コマンドの別名 → 正規化後のコマンド名
+    COMMAND_ALIASES = {
+        alias: command
+        for command, aliases in {
+            "add": ["追加", "たす", "add"],
+            "list": ["一覧", "リスト", "list", "show"],
+            "update": ["更新", "変更", "update"],
+            "help": ["help", "ヘルプ", "使い方"],
+            "search": ["検索", "さがす", "search"],
+            "priority": ["優先", "priority"],
+            "category": ["分野", "カテゴリ", "category"],
+            "overdue": ["期限切れ", "overdue"]
+        }.items()
+        for alias in aliases
+    }
+
     def __init__(self, config, notion_service):
         """
         サービスの初期化
@@ -106,16 +125,11 @@ class SlackService:
         Returns:
             str: 正規化されたテキスト
         """
-        # メンションの除去
-        text = ' '.join(word for word in text.split() if not word.startswith('<@'))
-        
         # 全角文字の正規化
         text = text.replace('：', ':').replace('、', ',').replace('　', ' ')
         
-        # 余分な空白の除去
-        text = ' '.join(text.split())
-        
-        return text
+        # メンションと余分な空白の除去（1回の分割で処理）
+        return ' '.join(word for word in text.split() if not word.startswith('<@'))
 
     def _process_command(self, text, say):
         """
@@ -174,28 +188,14 @@ class SlackService:
         if not text:
             return None, None
             
-        words = text.lower().split()
+        # 正規化済みのテキストなので先頭の1語だけを切り出す
+        words = text.lower().split(None, 1)
         command = words[0]
         
         # コマンドの正規化
-        if command in ["追加", "たす", "add"]:
-            command = "add"
-        elif command in ["一覧", "リスト", "list", "show"]:
-            command = "list"
-        elif command in ["更新", "変更", "update"]:
-            command = "update"
-        elif command in ["help", "ヘルプ", "使い方"]:
-            command = "help"
-        elif command in ["検索", "さがす", "search"]:
-            command = "search"
-        elif command in ["優先", "priority"]:
-            command = "priority"
-        elif command in ["分野", "カテゴリ", "category"]:
-            command = "category"
-        elif command in ["期限切れ", "overdue"]:
-            command = "overdue"
+        command = self.COMMAND_ALIASES.get(command, command)
             
-        args = ' '.join(words[1:])
+        args = words[1] if len(words) > 1 else ''
         return command, args
 
     def _handle_add(self, args, say):
@@ -212,12 +212,31 @@ class SlackService:
                 "例2: add 数学の課題 明日まで")
             return
             
+        # 明示的な属性指定を1回の正規表現走査で抽出
+        title_text, *rest = args.split("|", 1)
+        tags = {
+            key: value.strip()
+            for key, value in TASK_TAG_PATTERN.findall(rest[0])
+        } if rest else {}
+
         # タスク情報の解析（AIと検証層を含む）
-        task_info = self.text_parser.parse_task_info(args)
+        task_info = self.text_parser.parse_task_info(title_text.strip() if tags else args)
         
         if not task_info or not task_info["title"]:
             say("タスクの追加に必要な情報が不足しています。")
             return
+
+        # 明示的な指定は解析結果より優先
+        if tags:
+            task_info["title"] = title_text.strip()
+            if tags.get("期限"):
+                task_info["due_date"] = tags["期限"]
+            if tags.get("優先度"):
+                task_info["priority"] = tags["優先度"]
+            if tags.get("分野"):
+                task_info["categories"] = [
+                    category.strip() for category in tags["分野"].split(",") if category.strip()
+                ]
             
         # 警告メッセージの確認
         warnings = task_info.get("warnings", [])
@@ -265,9 +284,9 @@ class SlackService:
         
         if args:
             # フィルター条件の解析
-            if args in [Task.STATUS_NOT_STARTED, Task.STATUS_IN_PROGRESS, Task.STATUS_COMPLETED]:
+            if args in Task.VALID_STATUSES:
                 filters["status"] = args
-            elif args in Task.VALID_CATEGORIES:
+            elif args in Task.VALID_CATEGORY_SET:
                 filters["category"] = args
                 
         # タスク一覧の取得
@@ -323,7 +342,7 @@ class SlackService:
 
     def _handle_priority_filter(self, args, say):
         """優先度フィルターの処理"""
-        if not args or args not in ["高", "中", "低"]:
+        if not args or args not in Task.VALID_PRIORITIES:
             say("優先度は「高」「中」「低」のいずれかを指定してください。")
             return
             
@@ -337,7 +356,7 @@ class SlackService:
 
     def _handle_category_filter(self, args, say):
         """カテゴリフィルターの処理"""
-        if not args or args not in Task.VALID_CATEGORIES:
+        if not args or args not in Task.VALID_CATEGORY_SET:
             say(f"カテゴリは {', '.join(Task.VALID_CATEGORIES)} のいずれかを指定してください。")
             return
             
@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional
 from models.ai.inference import AIInference
 from models.task import Task
 from models.ai.validator import ResultValidator
+from models.ai.keywords import KeywordScanner
 import logging
 
 class TextParser:
@@ -24,6 +25,12 @@ class TextParser:
         # カテゴリー判定用のキーワード辞書
         self.category_keywords = Task.CATEGORY_KEYWORDS
         self.priority_keywords = Task.PRIORITY_KEYWORDS
+        # 全キーワードを1回の走査で数えるスキャナー
+        self._category_scanner = KeywordScanner(self.category_keywords)
+        self._priority_scanner = KeywordScanner(self.priority_keywords)
+
+        # 結果の検証層（状態を持たないため1つを使い回す）
+        self.validator = ResultValidator()
 
         # AI推論の初期化
         self.ai_inference = None
@@ -31,48 +38,48 @@ class TextParser:
             try:
                 self.ai_inference = AIInference(model_paths)
             except Exception as e:
-                print(f"警告: AI推論の初期化に失敗: {e}")
+                self.logger.warning("AI推論の初期化に失敗: %s", e)
 
     def parse_task_info(self, text: str) -> Optional[Dict[str, Any]]:
         """タスク情報の抽出"""
-        self.logger.debug(f"=== parse_task_info開始 ===")
-        self.logger.debug(f"入力テキスト: {text}")
+        self.logger.debug("=== parse_task_info開始 ===")
+        self.logger.debug("入力テキスト: %s", text)
 
         original_text = text
 
         # 前処理（期限関連の表現は保持）
         cleaned_text = self._preprocess_text(text, preserve_datetime=True)
-        self.logger.debug(f"前処理後テキスト: {cleaned_text}")
+        self.logger.debug("前処理後テキスト: %s", cleaned_text)
 
         if not cleaned_text:
             return None
 
          # AI解析
         ai_result = self._ai_analysis(original_text) if self.ai_inference else None
-        self.logger.debug(f"AI解析結果: {ai_result}")
+        self.logger.debug("AI解析結果: %s", ai_result)
 
         # ルールベース解析
         rule_based_result = self._rule_based_analysis(original_text, ai_result)
-        self.logger.debug(f"ルールベース解析結果: {rule_based_result}")
+        self.logger.debug("ルールベース解析結果: %s", rule_based_result)
 
         # 結果の統合
         final_result = self._integrate_results(rule_based_result, ai_result)
-        self.logger.debug(f"統合結果: {final_result}")
+        self.logger.debug("統合結果: %s", final_result)
         self.logger.debug("=== parse_task_info終了 ===\n")
 
         return final_result
 
     def _preprocess_text(self, text: str, preserve_datetime: bool = False) -> Optional[str]:
         """テキストの前処理"""
-        self.logger.debug(f"=== テキスト前処理開始 ===")
-        self.logger.debug(f"処理前: {text}")
+        self.logger.debug("=== テキスト前処理開始 ===")
+        self.logger.debug("処理前: %s", text)
         
         if not text:
             return None
 
         # 全角文字の置換
         text = text.replace('：', ':').replace('、', ',').replace('　', ' ')
-        self.logger.debug(f"文字置換後: {text}")
+        self.logger.debug("文字置換後: %s", text)
 
         if not preserve_datetime:
             # 日時表現を削除（preserve_datetimeがFalseの場合のみ）
@@ -80,7 +87,7 @@ class TextParser:
 
         # 前後の空白を削除
         cleaned_text = text.strip()
-        self.logger.debug(f"前処理後: {cleaned_text}")
+        self.logger.debug("前処理後: %s", cleaned_text)
         self.logger.debug("=== テキスト前処理終了 ===\n")
         
         return cleaned_text
@@ -273,9 +280,10 @@ class TextParser:
         matched_categories = []
         max_confidence = Task.CONFIDENCE["BASE"]
         
-        # 既存カテゴリのキーワードマッチング
-        for category, keywords in self.category_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in text)
+        # 既存カテゴリのキーワードマッチング（全カテゴリのキーワードを1回で数える）
+        category_matches = self._category_scanner.count(text)
+        for category in self.category_keywords:
+            matches = category_matches[category]
             if matches:
                 confidence = min(
                     Task.CONFIDENCE["BASE"] + matches * Task.CONFIDENCE["INCREMENT"],
@@ -317,9 +325,10 @@ class TextParser:
         if date_info:
             date_based_priority = self._get_date_based_priority(date_info)
         
-        # キーワードベースの優先度判定
-        for priority, keywords in self.priority_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in text)
+        # キーワードベースの優先度判定（全優先度のキーワードを1回で数える）
+        priority_matches = self._priority_scanner.count(text)
+        for priority in self.priority_keywords:
+            matches = priority_matches[priority]
             if matches:
                 # キーワードマッチングベースの信頼度計算（カテゴリと優先度で共通）
                 # 基準値0.5 + マッチ数×0.1（上限1.0）
@@ -377,8 +386,8 @@ class TextParser:
         Returns:
             str: クリーニングされたタイトル
         """
-        self.logger.debug(f"=== タイトルクリーニング開始 ===")
-        self.logger.debug(f"クリーニング前: {text}")
+        self.logger.debug("=== タイトルクリーニング開始 ===")
+        self.logger.debug("クリーニング前: %s", text)
 
         # ルールベースでの処理
         patterns = [
@@ -399,34 +408,35 @@ class TextParser:
             r'必要|予定|こと',
         ]
         
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         cleaned_text = text
         for pattern in patterns:
             before_clean = cleaned_text
             cleaned_text = re.sub(pattern, ' ', cleaned_text)
-            if before_clean != cleaned_text:
-                self.logger.debug(f"パターン '{pattern}' 適用後: {cleaned_text}")
+            if debug_enabled and before_clean != cleaned_text:
+                self.logger.debug("パターン '%s' 適用後: %s", pattern, cleaned_text)
         
         # 複数の空白を1つに整理
         cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-        self.logger.debug(f"空白整理後: {cleaned_text}")
+        self.logger.debug("空白整理後: %s", cleaned_text)
         
         # 前後の空白を削除
         cleaned_text = cleaned_text.strip()
-        self.logger.debug(f"前後空白削除後: {cleaned_text}")
+        self.logger.debug("前後空白削除後: %s", cleaned_text)
         
         # 「〜の」で終わる場合、「の」を削除
         if cleaned_text.endswith('の'):
             cleaned_text = cleaned_text[:-1]
-            self.logger.debug(f"末尾「の」削除後: {cleaned_text}")
+            self.logger.debug("末尾「の」削除後: %s", cleaned_text)
         
         # 文末の「提出」などの一般的な動詞を削除
         if cleaned_text.endswith(('提出', '作成', '実施', '実行')):
             cleaned_text = cleaned_text[:-2]
-            self.logger.debug(f"末尾動詞削除後: {cleaned_text}")
+            self.logger.debug("末尾動詞削除後: %s", cleaned_text)
         
         # 最終的なタイトルの整形（例：「統計学 レポート」→「統計学レポート」）
         final_title = cleaned_text.replace(' ', '')
-        self.logger.debug(f"最終タイトル: {final_title}")
+        self.logger.debug("最終タイトル: %s", final_title)
         self.logger.debug("=== タイトルクリーニング終了 ===\n")
         
         return final_title
@@ -465,8 +475,7 @@ class TextParser:
             }
         """
         # ResultValidatorを使用して結果を検証・統合
-        validator = ResultValidator()
-        validated_result = validator.validate_results(rule_based, ai_result)
+        validated_result = self.validator.validate_results(rule_based, ai_result)
 
         # カテゴリの統合
         categories = set()
@@ -480,7 +489,7 @@ class TextParser:
             # 有効なカテゴリのみを追加
             ai_categories = [
                 cat for cat in ai_result["categories"]
-                if cat in Task.VALID_CATEGORIES
+                if cat in Task.VALID_CATEGORY_SET
             ]
             categories.update(ai_categories)
     